@@ -1,15 +1,32 @@
-from .orchestrator import AgentOrchestrator
-from .idea_hunter import IdeaHunterAgent
-from .market_miner import MarketMinerAgent
-from .model_judge import ModelJudgeAgent
-from .risk_oracle import RiskOracleAgent
-from .valuator_x import ValuatorXAgent
+import importlib
+
+# Exported name -> defining module. Nothing is imported until first use, so
+# `from backend.agents.cache import TTLCache` doesn't drag in every agent.
+_EXPORTS = {
+    "AgentOrchestrator": ".orchestrator",
+    "EvaluationCache": ".cache",
+    "IdeaHunterAgent": ".idea_hunter",
+    "MarketMinerAgent": ".market_miner",
+    "ModelJudgeAgent": ".model_judge",
+    "RiskOracleAgent": ".risk_oracle",
+    "ValuatorXAgent": ".valuator_x"
+}
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "AgentOrchestrator",
+    "EvaluationCache",
     "IdeaHunterAgent", 
     "MarketMinerAgent",
     "ModelJudgeAgent",
     "RiskOracleAgent",
     "ValuatorXAgent"
-]
\ No newline at end of file
+]
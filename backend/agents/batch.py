@@ -0,0 +1,33 @@
+from typing import Callable, List, Optional
+
+from ..models import AgentScore
+
+def score_groups(keys, score: Callable[[int], AgentScore]) -> List[Optional[AgentScore]]:
+    """Score each distinct row of ``keys`` once and hand the result to every document in its group
+
+    ``keys`` is a 2-D array holding, per document, everything its score
+    depends on; ``score(row)`` scores one representative document. A group
+    whose representative raises gets None - the scalar path raises for
+    every document in it. Documents in a group share one AgentScore, so
+    copy it before handing it out.
+    """
+    import numpy as np
+
+    if len(keys) == 0:
+        return []
+
+    # One code per distinct row, built column by column (cheaper than sorting whole rows)
+    codes = np.zeros(len(keys), dtype=np.int64)
+    for column in np.asarray(keys).T:
+        values, inverse = np.unique(column, return_inverse=True)
+        codes = np.unique(codes * len(values) + inverse.ravel(), return_inverse=True)[1].ravel()
+    _, first_rows, groups = np.unique(codes, return_index=True, return_inverse=True)
+
+    group_scores = []
+    for row in first_rows.tolist():
+        try:
+            group_scores.append(score(row))
+        except Exception:
+            group_scores.append(None)
+
+    return [group_scores[group] for group in groups.ravel().tolist()]
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from ..models import CompanyDoc
+
+class TTLCache:
+    """In-process LRU cache with per-entry time-to-live"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all entries and reset counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+class EvaluationCache:
+    """Two-layer result cache: per-agent scores and whole evaluations
+
+    Keys are content fingerprints of the CompanyDoc fields an agent reads
+    plus the agent's version, so resubmitting an unchanged company - even
+    under a new id - is served from memory, while bumping an agent's
+    ``version`` transparently invalidates its old entries.
+    """
+
+    def __init__(
+        self,
+        agent_maxsize: int = 10000,
+        agent_ttl: float = 24 * 3600.0,
+        evaluation_maxsize: int = 2000,
+        evaluation_ttl: float = 24 * 3600.0
+    ):
+        self.agent_scores = TTLCache(agent_maxsize, agent_ttl)
+        self.evaluations = TTLCache(evaluation_maxsize, evaluation_ttl)
+
+    @staticmethod
+    def fingerprint(company_doc: CompanyDoc, fields: Iterable[str], version: str) -> str:
+        """Stable hash of the given CompanyDoc fields and a version tag"""
+        payload = json.dumps(
+            {
+                "fields": {field: getattr(company_doc, field) for field in fields},
+                "version": version
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def combine(*parts: str) -> str:
+        """Derive a single key from several component keys"""
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def clear(self):
+        self.agent_scores.clear()
+        self.evaluations.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "agent_scores": self.agent_scores.stats(),
+            "evaluations": self.evaluations.stats()
+        }
@@ -1,16 +1,23 @@
 import asyncio
-from typing import List
-import openai
-import os
+import json
+from typing import List, Optional
 
 from ..models import CompanyDoc, AgentScore
+from .llm_client import LLMClient, get_llm_client
 
 class IdeaHunterAgent:
     """LLM-driven feasibility and originality detection"""
     
-    def __init__(self):
+    def __init__(self, llm_client: Optional[LLMClient] = None):
         self.name = "idea_hunter"
-        openai.api_key = os.getenv("OPENAI_API_KEY")
+        self.version = "1"
+        self.input_fields = ("name", "stage", "description", "business_model")
+        self._llm_client = llm_client
+    
+    @property
+    def llm(self) -> LLMClient:
+        """Injected client, or the shared pooled one"""
+        return self._llm_client or get_llm_client()
     
     async def evaluate(self, company_doc: CompanyDoc) -> AgentScore:
         """Evaluate idea feasibility and originality"""
@@ -45,24 +52,15 @@ class IdeaHunterAgent:
         """
         
         try:
-            response = await openai.ChatCompletion.acreate(
+            content = await self.llm.chat_completion(
                 model="gpt-4",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
-                max_tokens=1000
+                max_tokens=1000,
+                validate=self._parse  # Only well-formed responses are cached
             )
             
-            import json
-            result = json.loads(response.choices[0].message.content)
-            
-            return AgentScore(
-                agent_name=self.name,
-                score=result["overall_score"],
-                confidence=result["confidence"],
-                reasoning=result["reasoning"],
-                red_flags=result.get("red_flags", []),
-                recommendations=result.get("recommendations", [])
-            )
+            return self._parse(content)
             
         except Exception as e:
             # Fallback scoring
@@ -72,5 +70,19 @@ class IdeaHunterAgent:
                 confidence=0.3,
                 reasoning=f"Error in evaluation: {str(e)}",
                 red_flags=["Agent evaluation failed"],
-                recommendations=["Review idea description", "Provide more details"]
-            )
\ No newline at end of file
+                recommendations=["Review idea description", "Provide more details"],
+                degraded=True
+            )
+    
+    def _parse(self, content: str) -> AgentScore:
+        """AgentScore from the model's JSON response; raises if it is malformed"""
+        result = json.loads(content)
+        
+        return AgentScore(
+            agent_name=self.name,
+            score=result["overall_score"],
+            confidence=result["confidence"],
+            reasoning=result["reasoning"],
+            red_flags=result.get("red_flags", []),
+            recommendations=result.get("recommendations", [])
+        )
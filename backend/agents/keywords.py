@@ -0,0 +1,185 @@
+import re
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Set, Tuple
+
+# Words are runs of letters/digits, so "AI-powered" yields "ai" but "maintain" does not
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Batch scans join lowercased texts with "Z", which lower() never produces
+_TEXT_SEPARATOR = "Z"
+_BATCH_TOKEN_RE = re.compile(r"[a-z0-9]+|Z")
+
+def normalize(pattern: str) -> str:
+    """Canonical form of a pattern: lowercase tokens joined by single spaces"""
+    return " ".join(TOKEN_RE.findall(pattern.lower()))
+
+class KeywordMatcher:
+    """Word-boundary multi-pattern matcher
+
+    Text is tokenized once; single-word patterns are found with one set
+    intersection and multi-word phrases by intersecting the text's n-grams
+    with the phrase table for each phrase length. Overlapping patterns
+    (e.g. "subscription" and "monthly subscription") are all reported.
+    ``find_many`` does the same for a whole batch of texts with array
+    operations.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = frozenset(filter(None, (normalize(p) for p in patterns)))
+        self._words = frozenset(p for p in self.patterns if " " not in p)
+
+        phrases: Dict[int, Set[Tuple[str, ...]]] = {}
+        for pattern in self.patterns - self._words:
+            tokens = tuple(pattern.split(" "))
+            phrases.setdefault(len(tokens), set()).add(tokens)
+        self._phrases = {length: frozenset(grams) for length, grams in phrases.items()}
+
+        # Batch tables: every pattern word gets an id, phrases a code over their word ids
+        self.columns = {pattern: column for column, pattern in enumerate(sorted(self.patterns))}
+        words = sorted({word for pattern in self.patterns for word in pattern.split(" ")})
+        self._word_ids = {word: word_id for word_id, word in enumerate(words)}
+        self._word_columns = [self.columns.get(word, -1) for word in words]
+        self._vocabulary = len(words)
+        self._phrase_columns = {
+            length: {self._phrase_code(grams): self.columns[" ".join(grams)] for grams in phrases_of_length}
+            for length, phrases_of_length in self._phrases.items()
+        }
+        self._word_ids[_TEXT_SEPARATOR] = -2
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Return the set of (normalized) patterns present in text"""
+        tokens = TOKEN_RE.findall(text.lower())
+        hits = set(self._words.intersection(tokens))
+
+        for length, phrases in self._phrases.items():
+            if len(tokens) >= length:
+                ngrams = zip(*(tokens[offset:] for offset in range(length)))
+                hits.update(" ".join(gram) for gram in phrases.intersection(ngrams))
+
+        return frozenset(hits)
+
+    def find_many(self, texts: Sequence[Optional[str]]):
+        """Boolean matrix of the patterns in each text: one row per text, one column per ``columns`` entry
+
+        All texts are tokenized in a single regex pass; words are then
+        matched through their ids and phrases as codes over consecutive
+        ids that don't cross from one text into the next, all in NumPy.
+        """
+        import numpy as np
+
+        hits = np.zeros((len(texts), len(self.columns)), dtype=bool)
+        tokens = _BATCH_TOKEN_RE.findall(_TEXT_SEPARATOR.join(text.lower() if text else "" for text in texts))
+        ids = np.fromiter(map(self._word_ids.get, tokens, repeat(-1, len(tokens))), dtype=np.int64, count=len(tokens))
+
+        # Separators advance the text index and are then dropped
+        separators = ids == -2
+        rows = np.cumsum(separators)[~separators]
+        ids = ids[~separators]
+        known = ids >= 0
+
+        word_columns = np.array(self._word_columns + [-1], dtype=np.int64)[ids]  # unknown (-1) -> last entry
+        words = word_columns >= 0
+        hits[rows[words], word_columns[words]] = True
+
+        for length, codes in self._phrase_columns.items():
+            windows = len(ids) - length + 1
+            if windows <= 0:
+                continue
+            valid = rows[:windows] == rows[length - 1:]
+            code = np.zeros(windows, dtype=np.int64)
+            for offset in range(length):
+                valid &= known[offset:offset + windows]
+                code = code * self._vocabulary + ids[offset:offset + windows]
+
+            phrase_codes = np.array(sorted(codes), dtype=np.int64)
+            phrase_columns = np.array([codes[phrase_code] for phrase_code in phrase_codes.tolist()], dtype=np.int64)
+            positions = np.minimum(np.searchsorted(phrase_codes, code), len(phrase_codes) - 1)
+            matched = valid & (phrase_codes[positions] == code)
+            hits[rows[:windows][matched], phrase_columns[positions[matched]]] = True
+
+        return hits
+
+    def _phrase_code(self, grams: Tuple[str, ...]) -> int:
+        code = 0
+        for word in grams:
+            code = code * self._vocabulary + self._word_ids[word]
+        return code
+
+class HitMatrix:
+    """Keyword hits for a batch of documents (see ``keyword_hits_batch``)"""
+
+    def __init__(self, hits, columns: Dict[str, int]):
+        self.hits = hits
+        self.columns = columns
+
+    def __or__(self, other: "HitMatrix") -> "HitMatrix":
+        return HitMatrix(self.hits | other.hits, self.columns)
+
+    def count(self, patterns: Iterable[str]):
+        """How many of ``patterns`` each document contains, like ``sum(p in hits for p in patterns)``"""
+        columns = [self.columns[pattern] for pattern in patterns if pattern in self.columns]
+        return self.hits[:, columns].sum(axis=1)
+
+    def any(self, patterns: Iterable[str]):
+        """Whether each document contains any of ``patterns``"""
+        return self.count(patterns) > 0
+
+# Shared registry: agents register their pattern tables once and all of
+# them query a single matcher built from the union.
+_registered: Set[str] = set()
+_matcher: Optional[KeywordMatcher] = None
+
+def register_patterns(patterns: Iterable[str]):
+    """Add patterns to the shared matcher (rebuilt lazily if anything is new)"""
+    global _matcher
+
+    new_patterns = {normalize(p) for p in patterns} - _registered
+    if new_patterns:
+        _registered.update(new_patterns)
+        _matcher = None
+        _scan.cache_clear()
+        _scan_many.cache_clear()
+
+def get_matcher() -> KeywordMatcher:
+    global _matcher
+
+    if _matcher is None:
+        _matcher = KeywordMatcher(_registered)
+    return _matcher
+
+@lru_cache(maxsize=2048)
+def _scan(text: str) -> FrozenSet[str]:
+    return get_matcher().find(text)
+
+@lru_cache(maxsize=8)
+def _scan_many(texts: Tuple[Optional[str], ...]):
+    hits = get_matcher().find_many(texts)
+    hits.flags.writeable = False  # shared between callers
+    return hits
+
+def keyword_hits_batch(*fields: Sequence[Optional[str]]) -> HitMatrix:
+    """Batch form of ``keyword_hits``: row i holds the patterns in any of ``fields[k][i]``
+
+    ``HitMatrix.count`` and ``any`` answer the membership tests agents
+    make against a ``keyword_hits`` set, for every document at once. Like
+    ``keyword_hits``, each field is scanned once and memoized, so agents
+    scoring the same batch share a single pass over it.
+    """
+    hits = None
+    for texts in fields:
+        found = _scan_many(tuple(texts))
+        hits = found if hits is None else hits | found
+    return HitMatrix(hits, get_matcher().columns)
+
+def keyword_hits(*texts: Optional[str]) -> FrozenSet[str]:
+    """Patterns found in any of the given texts
+
+    Each text is scanned once and memoized, so agents looking at the same
+    CompanyDoc fields share a single pass over them.
+    """
+    hits: FrozenSet[str] = frozenset()
+    for text in texts:
+        if text:
+            hits = hits | _scan(text)
+    return hits
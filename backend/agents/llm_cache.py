@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+class LLMResponseCache:
+    """Persistent prompt -> response cache backed by SQLite
+
+    Keys are a hash of the model, temperature and the normalized prompt
+    (whitespace collapsed, only role and content kept), so cosmetic prompt
+    changes still hit. Entries survive restarts and the file is kept under
+    ``max_bytes`` by evicting the least recently used responses.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_llm_responses_last_used ON llm_responses (last_used_at)")
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+
+    @staticmethod
+    def normalize_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Drop irrelevant fields and collapse whitespace in message content"""
+        return [
+            {"role": message.get("role", "user"), "content": " ".join(str(message.get("content", "")).split())}
+            for message in messages
+        ]
+
+    @classmethod
+    def key(cls, messages: List[Dict[str, Any]], model: str, temperature: float) -> str:
+        payload = json.dumps(
+            {"model": model, "temperature": temperature, "messages": cls.normalize_messages(messages)},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for key, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT response FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE llm_responses SET last_used_at = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, model: str, response: str):
+        """Store a response, evicting old entries if over the size limit"""
+        size = len(key) + len(response.encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, response, size, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now)
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until 90% of the size limit"""
+        target = int(self.max_bytes * 0.9)
+        rows = self._db.execute("SELECT key, size FROM llm_responses ORDER BY last_used_at").fetchall()
+
+        evicted = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+
+        self._db.executemany("DELETE FROM llm_responses WHERE key = ?", evicted)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM llm_responses")
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,264 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .llm_cache import LLMResponseCache
+
+def retryable_errors() -> tuple:
+    """Errors worth retrying: throttling, transient network failures and 5xx"""
+    import openai  # Deferred: the SDK is slow to import and only needed once a request is made
+
+    return (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+class TokenBucket:
+    """Async token bucket refilled continuously at a per-minute rate"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until ``amount`` tokens are available, then take them"""
+        amount = min(amount, self.capacity)
+
+        # Waiters queue on the lock, so the bucket is drained in FIFO order
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one in-flight task"""
+
+    def __init__(self):
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the in-flight call for ``key``, starting it if there is none"""
+        future = self._inflight.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        # Shielded so one caller giving up doesn't cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: str, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+class LLMClient:
+    """Shared chat-completion client with pooling, rate limiting and retries
+
+    One instance keeps a keep-alive connection pool, caps concurrent
+    requests, throttles both requests and tokens per minute with token
+    buckets, and retries throttled or transient failures with jittered
+    exponential backoff (honouring ``Retry-After`` when the provider sends
+    it). Identical concurrent requests (same messages and model parameters)
+    share a single provider call, and with a ``response_cache`` (or
+    ``LLM_CACHE_PATH``) responses are replayed from disk across restarts.
+    Point ``base_url`` (or ``OPENAI_BASE_URL``) at a local stand-in server
+    to exercise it without a real provider.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 60.0,
+        response_cache: Optional[LLMResponseCache] = None
+    ):
+        max_connections = max_connections or int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+        requests_per_minute = requests_per_minute or float(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+        tokens_per_minute = tokens_per_minute or float(os.getenv("LLM_TOKENS_PER_MINUTE", "40000"))
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self._slots = asyncio.Semaphore(max_connections)
+        self._single_flight = SingleFlight()
+
+        cache_path = os.getenv("LLM_CACHE_PATH")
+        if response_cache is None and cache_path:
+            response_cache = LLMResponseCache(
+                cache_path, max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+            )
+        self.response_cache = response_cache
+
+        import httpx
+        from openai import AsyncOpenAI
+
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30.0
+            ),
+            timeout=timeout
+        )
+        # Retries are handled here so they share the rate limiters
+        self._client = AsyncOpenAI(
+            api_key=api_key or os.getenv("OPENAI_API_KEY"),
+            base_url=base_url or os.getenv("OPENAI_BASE_URL"),
+            http_client=self._http,
+            max_retries=0
+        )
+
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "gpt-4",
+        temperature: float = 0.3,
+        max_tokens: int = 1000,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """Run a chat completion and return the first choice's content
+
+        ``validate`` is called on the content before it is written to the
+        response cache; if it raises, the response is returned uncached
+        (and a cached response that fails it counts as a miss), so a
+        truncated or malformed completion is never replayed.
+        """
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = self.response_cache.key(messages, model, temperature)
+            cached = await self._cache_get(cache_key)
+            if cached is not None and self._is_valid(cached, validate):
+                return cached
+
+        key = self.request_key(messages, model, temperature, max_tokens)
+        return await self._single_flight.do(
+            key, lambda: self._complete(messages, model, temperature, max_tokens, cache_key, validate)
+        )
+
+    @staticmethod
+    def request_key(messages: List[Dict[str, str]], model: str, temperature: float, max_tokens: int) -> str:
+        """Digest identifying a rendered prompt and its model parameters"""
+        payload = json.dumps(
+            {"messages": messages, "model": model, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        cache_key: Optional[str] = None,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        estimated_tokens = self._estimate_tokens(messages, max_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimated_tokens)
+
+            try:
+                async with self._slots:
+                    response = await self._client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens
+                    )
+                content = response.choices[0].message.content
+                if cache_key is not None and content is not None and self._is_valid(content, validate):
+                    await self._cache_set(cache_key, model, content)
+                return content
+            except retryable_errors() as e:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff_delay(attempt, e))
+
+    @staticmethod
+    def _is_valid(content: str, validate: Optional[Callable[[str], Any]]) -> bool:
+        if validate is None:
+            return True
+        try:
+            validate(content)
+        except Exception:
+            return False
+        return True
+
+    async def _cache_get(self, cache_key: str) -> Optional[str]:
+        """Cached response, treating cache errors as a miss"""
+        try:
+            return await asyncio.to_thread(self.response_cache.get, cache_key)
+        except Exception as e:
+            print(f"LLM response cache read failed: {e}")
+            return None
+
+    async def _cache_set(self, cache_key: str, model: str, content: str):
+        """Best-effort write: a cache failure must not fail a successful call"""
+        try:
+            await asyncio.to_thread(self.response_cache.set, cache_key, model, content)
+        except Exception as e:
+            print(f"LLM response cache write failed: {e}")
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Provider-requested delay if given, else full-jitter exponential backoff"""
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                return min(float(response.headers.get("retry-after")), self.backoff_max)
+            except (TypeError, ValueError):
+                pass
+
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def _estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Rough token budget for a request (~4 characters per token plus completion)"""
+        prompt_chars = sum(len(message.get("content", "")) for message in messages)
+        return prompt_chars // 4 + max_tokens
+
+    async def aclose(self):
+        await self._http.aclose()
+        if self.response_cache is not None:
+            self.response_cache.close()
+
+_shared_client: Optional[LLMClient] = None
+
+def get_llm_client() -> LLMClient:
+    """Process-wide LLM client, created on first use"""
+    global _shared_client
+
+    if _shared_client is None:
+        _shared_client = LLMClient()
+    return _shared_client
@@ -1,21 +1,28 @@
 import asyncio
-import requests
 import json
 from typing import Dict, List
 
 from ..models import CompanyDoc, AgentScore
+from .keywords import keyword_hits, register_patterns
 
 class MarketMinerAgent:
     """TAM/SAM/SOM triangulation using external APIs"""
     
     def __init__(self):
         self.name = "market_miner"
+        self.version = "2"
+        self.input_fields = ("description", "stage")
         # Mock API endpoints - replace with real data sources
         self.data_sources = {
             "statista": "https://api.statista.com/v1/market-size",
             "cb_insights": "https://api.cbinsights.com/v1/market-data",
             "crunchbase": "https://api.crunchbase.com/v4/searches"
         }
+        
+        # Simple keyword extraction - could use NLP
+        self.common_markets = ["fintech", "healthtech", "edtech", "saas", "ecommerce", 
+                               "ai", "blockchain", "iot", "mobile", "enterprise"]
+        register_patterns(self.common_markets)
     
     async def evaluate(self, company_doc: CompanyDoc) -> AgentScore:
         """Evaluate market size and opportunity"""
@@ -58,15 +65,8 @@ class MarketMinerAgent:
     
     def _extract_market_keywords(self, description: str) -> List[str]:
         """Extract relevant market/industry keywords"""
-        # Simple keyword extraction - could use NLP
-        common_markets = ["fintech", "healthtech", "edtech", "saas", "ecommerce", 
-                         "ai", "blockchain", "iot", "mobile", "enterprise"]
-        
-        keywords = []
-        description_lower = description.lower()
-        for market in common_markets:
-            if market in description_lower:
-                keywords.append(market)
+        hits = keyword_hits(description)
+        keywords = [market for market in self.common_markets if market in hits]
         
         return keywords if keywords else ["general"]
     
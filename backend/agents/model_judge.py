@@ -1,13 +1,17 @@
 import asyncio
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from ..models import CompanyDoc, AgentScore
+from .batch import score_groups
+from .keywords import keyword_hits, keyword_hits_batch, register_patterns
 
 class ModelJudgeAgent:
     """Business model viability scoring"""
     
     def __init__(self):
         self.name = "model_judge"
+        self.version = "2"
+        self.input_fields = ("description", "business_model", "team_info", "financials", "stage")
         
         # Business model templates and their viability patterns
         self.model_patterns = {
@@ -42,12 +46,58 @@ class ModelJudgeAgent:
                 "margin_profile": 0.7
             }
         }
+        
+        # Model detection patterns, checked in priority order
+        self.model_keywords = [
+            ("saas", ["saas", "software as a service", "monthly subscription"]),
+            ("marketplace", ["marketplace", "platform", "connect buyers"]),
+            ("freemium", ["freemium", "free tier", "premium features"]),
+            ("subscription", ["subscription", "recurring payment", "monthly fee"]),
+            ("transaction", ["transaction", "commission", "per transaction"])
+        ]
+        register_patterns(term for _, terms in self.model_keywords for term in terms)
     
     async def evaluate(self, company_doc: CompanyDoc) -> AgentScore:
         """Evaluate business model viability"""
         
         # Identify business model type
-        model_type = self._identify_model_type(company_doc)
+        return self._score(company_doc, self._identify_model_type(company_doc))
+    
+    def score_batch(self, company_docs: Sequence[CompanyDoc]) -> List[Optional[AgentScore]]:
+        """Score many companies at once
+        
+        Produces exactly the scores of ``evaluate``. Model types come from
+        one keyword scan over the whole batch, and as a score depends only
+        on a few discrete features (``_feature_key``), each distinct
+        combination is scored once. Entries are None where ``evaluate``
+        would raise.
+        """
+        import numpy as np
+        
+        if not company_docs:
+            return []
+        
+        # First model type in priority order with a matching term, else the fallback
+        hits = keyword_hits_batch(
+            [company_doc.description for company_doc in company_docs],
+            [company_doc.business_model for company_doc in company_docs]
+        )
+        model_types = [model_type for model_type, _ in self.model_keywords] + ["transaction"]
+        type_index = np.column_stack(
+            [hits.any(terms) for _, terms in self.model_keywords] + [np.ones(len(company_docs), dtype=bool)]
+        ).argmax(axis=1)
+        
+        keys = np.array(
+            [
+                (model_type,) + self._feature_key(company_doc)
+                for model_type, company_doc in zip(type_index.tolist(), company_docs)
+            ],
+            dtype=np.int64
+        )
+        return score_groups(keys, lambda row: self._score(company_docs[row], model_types[type_index[row]]))
+    
+    def _score(self, company_doc: CompanyDoc, model_type: str) -> AgentScore:
+        """Score a company whose business model type is known"""
         
         # Assess key viability dimensions
         viability_scores = self._assess_viability_dimensions(company_doc, model_type)
@@ -68,24 +118,36 @@ class ModelJudgeAgent:
             recommendations=insights["recommendations"]
         )
     
+    def _feature_key(self, company_doc: CompanyDoc) -> Tuple[int, ...]:
+        """Everything besides the model type that ``_score`` reads from a company"""
+        
+        financials = company_doc.financials
+        margin_band = 0
+        if "gross_margin" in financials:
+            margin = financials["gross_margin"]
+            try:
+                margin_band = 1 if margin > 0.7 else 2 if margin < 0.3 else 3
+            except TypeError:
+                margin_band = 4  # _score raises on it as well
+        
+        return (
+            company_doc.stage,
+            "revenue" in financials,
+            margin_band,
+            bool(company_doc.team_info) and len(company_doc.team_info) > 100,
+            bool(financials.get("mrr"))
+        )
+    
     def _identify_model_type(self, company_doc: CompanyDoc) -> str:
         """Identify business model from description"""
         
-        description = (company_doc.description + " " + (company_doc.business_model or "")).lower()
-        
-        # Model detection patterns
-        if any(term in description for term in ["saas", "software as a service", "monthly subscription"]):
-            return "saas"
-        elif any(term in description for term in ["marketplace", "platform", "connect buyers"]):
-            return "marketplace"
-        elif any(term in description for term in ["freemium", "free tier", "premium features"]):
-            return "freemium"
-        elif any(term in description for term in ["subscription", "recurring payment", "monthly fee"]):
-            return "subscription"
-        elif any(term in description for term in ["transaction", "commission", "per transaction"]):
-            return "transaction"
-        else:
-            return "transaction"  # Default fallback
+        hits = keyword_hits(company_doc.description, company_doc.business_model)
+        
+        for model_type, terms in self.model_keywords:
+            if any(term in hits for term in terms):
+                return model_type
+        
+        return "transaction"  # Default fallback
     
     def _assess_viability_dimensions(self, company_doc: CompanyDoc, model_type: str) -> Dict[str, float]:
         """Assess key business model dimensions"""
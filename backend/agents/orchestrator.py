@@ -1,26 +1,62 @@
 import asyncio
-from typing import Dict, List
+import importlib
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, MutableMapping, Optional, Tuple, Union
 from datetime import datetime
 import uuid
 
 from ..models import CompanyDoc, EvaluationResult, AgentScore, Verdict
-from .idea_hunter import IdeaHunterAgent
-from .market_miner import MarketMinerAgent
-from .model_judge import ModelJudgeAgent
-from .risk_oracle import RiskOracleAgent
-from .valuator_x import ValuatorXAgent
+from .cache import EvaluationCache
+
+# Agent name -> (module, class). Modules are imported and agents constructed
+# on first use, so importing the orchestrator stays cheap.
+AGENT_REGISTRY: Dict[str, Tuple[str, str]] = {
+    "idea_hunter": (".idea_hunter", "IdeaHunterAgent"),
+    "market_miner": (".market_miner", "MarketMinerAgent"),
+    "model_judge": (".model_judge", "ModelJudgeAgent"),
+    "risk_oracle": (".risk_oracle", "RiskOracleAgent"),
+    "valuator_x": (".valuator_x", "ValuatorXAgent")
+}
+
+class LazyAgents(MutableMapping):
+    """Agents keyed by name, each imported and constructed on first access"""
+    
+    def __init__(self, registry: Dict[str, Tuple[str, str]]):
+        self._registry = dict(registry)
+        self._instances: Dict[str, Any] = {}
+    
+    def __getitem__(self, name: str) -> Any:
+        agent = self._instances.get(name)
+        if agent is None:
+            module_name, class_name = self._registry[name]
+            module = importlib.import_module(module_name, __package__)
+            agent = self._instances[name] = getattr(module, class_name)()
+        return agent
+    
+    def __setitem__(self, name: str, agent: Any):
+        self._registry.setdefault(name, (type(agent).__module__, type(agent).__name__))
+        self._instances[name] = agent
+    
+    def __delitem__(self, name: str):
+        del self._registry[name]
+        self._instances.pop(name, None)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry)
+    
+    def __len__(self) -> int:
+        return len(self._registry)
 
 class AgentOrchestrator:
     """Orchestrates hybrid AI agent evaluation pipeline"""
     
-    def __init__(self):
-        self.agents = {
-            "idea_hunter": IdeaHunterAgent(),
-            "market_miner": MarketMinerAgent(), 
-            "model_judge": ModelJudgeAgent(),
-            "risk_oracle": RiskOracleAgent(),
-            "valuator_x": ValuatorXAgent()
-        }
+    def __init__(
+        self,
+        cache: Optional[EvaluationCache] = None,
+        agent_timeouts: Optional[Dict[str, float]] = None,
+        evaluation_budget: Optional[float] = 25.0
+    ):
+        self.agents = LazyAgents(AGENT_REGISTRY)
         
         # Stage-aware weighting matrix (from PRD Appendix A)
         self.stage_weights = {
@@ -33,34 +69,342 @@ class AgentOrchestrator:
             7: {"idea_hunter": 0.1, "market_miner": 0.2, "model_judge": 0.3, "risk_oracle": 0.2, "valuator_x": 0.2},
             8: {"idea_hunter": 0.05, "market_miner": 0.1, "model_judge": 0.15, "risk_oracle": 0.2, "valuator_x": 0.5}
         }
+        
+        # Content-addressed result cache (per-agent and whole-evaluation layers)
+        self.cache = cache if cache is not None else EvaluationCache()
+        
+        # Per-agent deadlines and overall latency budget, in seconds (None = unbounded).
+        # An agent that misses either gets the neutral fallback score.
+        self.agent_timeouts = {
+            "idea_hunter": 20.0,
+            "market_miner": 10.0,
+            "model_judge": 2.0,
+            "risk_oracle": 2.0,
+            "valuator_x": 2.0
+        }
+        self.agent_timeouts.update(agent_timeouts or {})
+        self.evaluation_budget = evaluation_budget
     
-    async def evaluate(self, company_doc: CompanyDoc) -> EvaluationResult:
-        """Main evaluation pipeline"""
+    async def evaluate(self, company_doc: CompanyDoc, use_cache: bool = True) -> EvaluationResult:
+        """Main evaluation pipeline
         
-        # Get stage-specific weights
+        Pass ``use_cache=False`` to bypass both cache layers and force every
+        agent to run (results are not written back to the cache either).
+        """
+        return await self._evaluate(company_doc, use_cache=use_cache)
+    
+    async def evaluate_stream(self, company_doc: CompanyDoc, use_cache: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """Evaluate one company, yielding progress as each agent completes
+        
+        Emits one ``{"event": "agent_score", ...}`` per agent in completion
+        order - carrying its AgentScore (None if it failed or timed out) and
+        the weighted score over the agents finished so far - followed by a
+        final ``{"event": "result", "result": EvaluationResult}``.
+        """
         weights = self.stage_weights.get(company_doc.stage, self.stage_weights[3])
+        weighted_total = 0.0
+        weight_seen = 0.0
+        completed = 0
+        
+        async for agent_name, outcome in self._evaluate_steps(company_doc, use_cache=use_cache):
+            if agent_name is None:
+                yield {"event": "result", "result": outcome}
+                continue
+            
+            score = outcome.score if outcome is not None else 0.5  # Neutral fallback
+            weight = weights.get(agent_name, 0.0)
+            weighted_total += score * weight
+            weight_seen += weight
+            completed += 1
+            
+            yield {
+                "event": "agent_score",
+                "agent": agent_name,
+                "score": outcome,
+                "running_score": weighted_total / weight_seen if weight_seen else score,
+                "completed": completed,
+                "total": len(self.agents)
+            }
+    
+    async def evaluate_many(
+        self,
+        company_docs: Union[Iterable[CompanyDoc], AsyncIterable[CompanyDoc]],
+        max_concurrency: int = 32,
+        agent_concurrency: Optional[Dict[str, int]] = None,
+        use_cache: bool = True,
+        batch_size: int = 512
+    ) -> AsyncIterator[EvaluationResult]:
+        """Evaluate many companies, yielding results in completion order
+        
+        At most ``max_concurrency`` evaluations are in flight at once, and
+        ``agent_concurrency`` caps how many concurrent calls each named agent
+        receives across all of them (e.g. ``{"idea_hunter": 4}`` to stay
+        within the LLM quota). Documents are pulled from ``company_docs``
+        lazily, ``batch_size`` at a time, so large or streaming inputs are
+        never fully materialized; agents with a ``score_batch`` score each
+        batch in one go instead of document by document.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        agent_limits = {
+            agent_name: asyncio.Semaphore(limit)
+            for agent_name, limit in (agent_concurrency or {}).items()
+        }
+        pending = set()
+        
+        try:
+            async for batch in self._iterate_batches(company_docs, batch_size):
+                for company_doc, precomputed in zip(batch, self._score_batch(batch)):
+                    if len(pending) >= max_concurrency:
+                        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            yield task.result()
+                    
+                    pending.add(asyncio.create_task(self._evaluate(company_doc, agent_limits, use_cache, precomputed)))
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # Consumer stopped early or an evaluation raised - don't leak work
+            for task in pending:
+                task.cancel()
+    
+    @staticmethod
+    async def _iterate_docs(
+        company_docs: Union[Iterable[CompanyDoc], AsyncIterable[CompanyDoc]]
+    ) -> AsyncIterator[CompanyDoc]:
+        """Normalize sync and async document sources"""
+        if hasattr(company_docs, "__aiter__"):
+            async for company_doc in company_docs:
+                yield company_doc
+        else:
+            for company_doc in company_docs:
+                yield company_doc
+    
+    @classmethod
+    async def _iterate_batches(
+        cls,
+        company_docs: Union[Iterable[CompanyDoc], AsyncIterable[CompanyDoc]],
+        batch_size: int
+    ) -> AsyncIterator[List[CompanyDoc]]:
+        """Group documents into lists of up to ``batch_size``"""
+        batch = []
+        async for company_doc in cls._iterate_docs(company_docs):
+            batch.append(company_doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _score_batch(self, company_docs: List[CompanyDoc]) -> List[Dict[str, AgentScore]]:
+        """Per-document scores from the agents that can score a whole batch at once
+        
+        Agents without ``score_batch``, documents a batch scorer returns
+        None for, and agents whose batch scoring fails are left to run
+        document by document as usual.
+        """
+        precomputed = [{} for _ in company_docs]
         
-        # Run agents in parallel
-        agent_tasks = []
         for agent_name, agent in self.agents.items():
-            task = asyncio.create_task(agent.evaluate(company_doc))
-            agent_tasks.append((agent_name, task))
+            if not hasattr(agent, "score_batch"):
+                continue
+            
+            try:
+                scores = agent.score_batch(company_docs)
+            except Exception as e:
+                print(f"Agent {agent_name} batch scoring failed: {e}")
+                continue
+            
+            for doc_scores, score_result in zip(precomputed, scores):
+                if score_result is not None:
+                    doc_scores[agent_name] = score_result
+        
+        return precomputed
+    
+    def _cache_keys(self, company_doc: CompanyDoc, weights: Dict[str, float]) -> Dict[str, str]:
+        """Per-agent cache keys, plus the whole-evaluation key under ``None``"""
+        keys = {
+            agent_name: self.cache.fingerprint(company_doc, agent.input_fields, f"{agent_name}:{agent.version}")
+            for agent_name, agent in self.agents.items()
+        }
+        keys[None] = self.cache.combine(*keys.values(), json.dumps(weights, sort_keys=True))
+        return keys
+    
+    async def _run_agent(
+        self,
+        agent_name: str,
+        company_doc: CompanyDoc,
+        agent_limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+        cache_key: Optional[str] = None,
+        precomputed: Optional[AgentScore] = None
+    ) -> AgentScore:
+        """Run a single agent, honouring its concurrency limit if one is set
+        
+        The agent's own timeout starts once it holds a concurrency slot, so
+        time spent queueing counts only against the evaluation budget. A
+        ``precomputed`` score (from ``score_batch``) stands in for the run.
+        """
+        if cache_key is not None:
+            cached = self.cache.agent_scores.get(cache_key)
+            if cached is not None:
+                return cached.model_copy(deep=True)
+        
+        agent = self.agents[agent_name]
+        limit = (agent_limits or {}).get(agent_name)
+        timeout = self.agent_timeouts.get(agent_name)
+        
+        if precomputed is not None:
+            # Batch scores may be shared between documents
+            score_result = precomputed.model_copy(deep=True)
+        elif limit is None:
+            score_result = await asyncio.wait_for(agent.evaluate(company_doc), timeout)
+        else:
+            async with limit:
+                score_result = await asyncio.wait_for(agent.evaluate(company_doc), timeout)
+        
+        # Never pin a fallback score in the cache
+        if cache_key is not None and not score_result.degraded:
+            self.cache.agent_scores.set(cache_key, score_result.model_copy(deep=True))
+        
+        return score_result
+    
+    async def _run_agents(
+        self,
+        company_doc: CompanyDoc,
+        agent_limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+        cache_keys: Optional[Dict[str, str]] = None,
+        precomputed: Optional[Dict[str, AgentScore]] = None
+    ) -> AsyncIterator[Tuple[str, Optional[AgentScore]]]:
+        """Run all agents concurrently, yielding ``(agent_name, score)`` in completion order
+        
+        Agents that fail, miss their own timeout (enforced in ``_run_agent``)
+        or outlast the evaluation budget are cancelled and yielded with a
+        score of None.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        budget_deadline = started + self.evaluation_budget if self.evaluation_budget is not None else None
+        
+        tasks = {}
+        deadlines = {}
+        for agent_name in self.agents:
+            task = asyncio.create_task(
+                self._run_agent(
+                    agent_name,
+                    company_doc,
+                    agent_limits,
+                    (cache_keys or {}).get(agent_name),
+                    (precomputed or {}).get(agent_name)
+                )
+            )
+            tasks[task] = agent_name
+            deadlines[task] = budget_deadline
+        
+        pending = set(tasks)
+        try:
+            while pending:
+                now = loop.time()
+                
+                expired = {task for task in pending if deadlines[task] is not None and deadlines[task] <= now}
+                for task in expired:
+                    task.cancel()
+                    print(f"Agent {tasks[task]} timed out after {now - started:.2f}s")
+                    yield tasks[task], None
+                pending -= expired
+                if not pending:
+                    break
+                
+                upcoming = [deadlines[task] for task in pending if deadlines[task] is not None]
+                timeout = max(min(upcoming) - now, 0) if upcoming else None
+                
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        yield tasks[task], task.result()
+                    except asyncio.TimeoutError:
+                        print(f"Agent {tasks[task]} timed out after {self.agent_timeouts.get(tasks[task])}s")
+                        yield tasks[task], None
+                    except Exception as e:
+                        print(f"Agent {tasks[task]} failed: {e}")
+                        yield tasks[task], None
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _evaluate(
+        self,
+        company_doc: CompanyDoc,
+        agent_limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+        use_cache: bool = True,
+        precomputed: Optional[Dict[str, AgentScore]] = None
+    ) -> EvaluationResult:
+        """Evaluate one company with optional per-agent concurrency limits and precomputed agent scores"""
+        result = None
+        async for _, outcome in self._evaluate_steps(company_doc, agent_limits, use_cache, precomputed):
+            result = outcome  # The final step carries the EvaluationResult
+        return result
+    
+    async def _evaluate_steps(
+        self,
+        company_doc: CompanyDoc,
+        agent_limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+        use_cache: bool = True,
+        precomputed: Optional[Dict[str, AgentScore]] = None
+    ) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        """Core pipeline: yields ``(agent_name, score)`` as agents finish, then ``(None, result)``"""
+        
+        # Get stage-specific weights
+        weights = self.stage_weights.get(company_doc.stage, self.stage_weights[3])
+        
+        # Serve unchanged resubmissions straight from the evaluation cache
+        cache_keys = self._cache_keys(company_doc, weights) if use_cache else {}
+        if use_cache:
+            cached = self.cache.evaluations.get(cache_keys[None])
+            if cached is not None:
+                result = cached.model_copy(
+                    update={
+                        "id": str(uuid.uuid4()),
+                        "company_id": company_doc.id,
+                        "privacy_mode": company_doc.privacy_mode,
+                        "timestamp": datetime.utcnow()
+                    },
+                    deep=True
+                )
+                for score_result in result.detailed_scores:
+                    yield score_result.agent_name, score_result
+                yield None, result
+                return
+        
+        # Run agents in parallel and collect results as they finish
+        completed = {}
+        async for agent_name, score_result in self._run_agents(company_doc, agent_limits, cache_keys, precomputed):
+            completed[agent_name] = score_result
+            yield agent_name, score_result
         
-        # Collect results
         agent_scores = {}
         detailed_scores = []
         all_recommendations = []
+        degraded_agents = []
         
-        for agent_name, task in agent_tasks:
-            try:
-                score_result = await task
-                agent_scores[agent_name] = score_result.score
-                detailed_scores.append(score_result)
-                all_recommendations.extend(score_result.recommendations)
-            except Exception as e:
+        for agent_name in self.agents:
+            score_result = completed.get(agent_name)
+            if score_result is None:
                 # Graceful degradation
-                print(f"Agent {agent_name} failed: {e}")
                 agent_scores[agent_name] = 0.5  # Neutral score
+                degraded_agents.append(agent_name)
+                continue
+            
+            agent_scores[agent_name] = score_result.score
+            detailed_scores.append(score_result)
+            all_recommendations.extend(score_result.recommendations)
+            if score_result.degraded:
+                degraded_agents.append(agent_name)
         
         # Calculate weighted overall score
         overall_score = sum(
@@ -77,7 +421,7 @@ class AgentOrchestrator:
             company_doc, overall_score, detailed_scores, weights
         )
         
-        return EvaluationResult(
+        result = EvaluationResult(
             id=str(uuid.uuid4()),
             company_id=company_doc.id,
             verdict=verdict,
@@ -87,8 +431,16 @@ class AgentOrchestrator:
             explanation=explanation,
             recommendations=list(set(all_recommendations))[:5],  # Top 5 unique
             stage_weights=weights,
-            privacy_mode=company_doc.privacy_mode
+            privacy_mode=company_doc.privacy_mode,
+            partial=bool(degraded_agents),
+            degraded_agents=degraded_agents
         )
+        
+        # Only complete evaluations are reusable
+        if use_cache and not result.partial:
+            self.cache.evaluations.set(cache_keys[None], result.model_copy(deep=True))
+        
+        yield None, result
     
     def _determine_verdict(self, score: float, detailed_scores: List[AgentScore]) -> Verdict:
         """Apply verdict logic with red flag consideration"""
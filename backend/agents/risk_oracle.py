@@ -1,15 +1,19 @@
 import asyncio
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 
 from ..models import CompanyDoc, AgentScore
+from .batch import score_groups
+from .keywords import keyword_hits, keyword_hits_batch, normalize, register_patterns
 
 class RiskOracleAgent:
     """Red-flag and dilution/failure predictors"""
     
     def __init__(self):
         self.name = "risk_oracle"
+        self.version = "2"
+        self.input_fields = ("description", "business_model", "team_info", "financials", "stage")
         
         # Risk patterns and weights
         self.risk_patterns = {
@@ -51,15 +55,81 @@ class RiskOracleAgent:
             7: ["failed pivot", "cash flow problems", "team exodus"],
             8: ["valuation concerns", "due diligence issues", "market downturn"]
         }
+        
+        # Any single word of an indicator counts as a hit
+        self.failure_indicator_words = {
+            stage: [[normalize(word) for word in indicator.split()] for indicator in indicators]
+            for stage, indicators in self.failure_indicators.items()
+        }
+        
+        register_patterns(
+            pattern for risk_data in self.risk_patterns.values() for pattern in risk_data["patterns"]
+        )
+        register_patterns(
+            word for indicators in self.failure_indicator_words.values()
+            for words in indicators for word in words
+        )
     
     async def evaluate(self, company_doc: CompanyDoc) -> AgentScore:
         """Evaluate risk factors and failure probability"""
         
+        return self._score(
+            company_doc, self._count_risk_matches(company_doc), self._count_failure_indicators(company_doc)
+        )
+    
+    def score_batch(self, company_docs: Sequence[CompanyDoc]) -> List[Optional[AgentScore]]:
+        """Score many companies at once
+        
+        Produces exactly the scores of ``evaluate``. Pattern and indicator
+        counts come from one keyword scan per field over the whole batch;
+        companies with the same counts, stage and financials/team flags
+        share a score, so each combination is scored once. Entries are
+        None where ``evaluate`` would raise.
+        """
+        import numpy as np
+        
+        if not company_docs:
+            return []
+        
+        descriptions = keyword_hits_batch([company_doc.description for company_doc in company_docs])
+        business_models = keyword_hits_batch([company_doc.business_model for company_doc in company_docs])
+        team_infos = keyword_hits_batch([company_doc.team_info for company_doc in company_docs])
+        risk_hits = descriptions | business_models | team_infos
+        indicator_hits = descriptions | team_infos
+        
+        risk_types = list(self.risk_patterns)
+        category_matches = np.column_stack(
+            [risk_hits.count(self.risk_patterns[risk_type]["patterns"]) for risk_type in risk_types]
+        )
+        
+        stages = np.array([company_doc.stage for company_doc in company_docs], dtype=np.int64)
+        indicator_matches = np.zeros(len(company_docs), dtype=np.int64)
+        for stage, stage_indicators in self.failure_indicator_words.items():
+            at_stage = stages == stage
+            if at_stage.any():
+                indicator_matches[at_stage] = np.sum(
+                    [indicator_hits.any(indicator_words)[at_stage] for indicator_words in stage_indicators], axis=0
+                )
+        
+        keys = np.column_stack([
+            category_matches,
+            indicator_matches,
+            stages,
+            [bool(company_doc.financials) for company_doc in company_docs],
+            [bool(company_doc.team_info) and len(company_doc.team_info) < 50 for company_doc in company_docs]
+        ])
+        return score_groups(keys, lambda row: self._score(
+            company_docs[row], dict(zip(risk_types, category_matches[row].tolist())), int(indicator_matches[row])
+        ))
+    
+    def _score(self, company_doc: CompanyDoc, category_matches: Dict[str, int], indicator_matches: int) -> AgentScore:
+        """Score a company from its risk pattern and failure indicator counts"""
+        
         # Assess different risk categories
-        risk_scores = self._assess_risk_categories(company_doc)
+        risk_scores = self._assess_risk_categories(category_matches)
         
         # Check for failure indicators
-        failure_risk = self._assess_failure_indicators(company_doc)
+        failure_risk = self._assess_failure_indicators(company_doc, indicator_matches)
         
         # Calculate overall risk score (inverted - higher score = lower risk)
         overall_risk = sum(risk_scores.values()) / len(risk_scores)
@@ -79,20 +149,37 @@ class RiskOracleAgent:
             recommendations=insights["recommendations"]
         )
     
-    def _assess_risk_categories(self, company_doc: CompanyDoc) -> Dict[str, float]:
-        """Assess risk across different categories"""
+    def _count_risk_matches(self, company_doc: CompanyDoc) -> Dict[str, int]:
+        """Number of pattern hits per risk category"""
         
-        content = (
-            company_doc.description + " " + 
-            (company_doc.business_model or "") + " " + 
-            (company_doc.team_info or "")
-        ).lower()
+        hits = keyword_hits(company_doc.description, company_doc.business_model, company_doc.team_info)
+        
+        return {
+            risk_type: sum(1 for pattern in risk_data["patterns"] if pattern in hits)
+            for risk_type, risk_data in self.risk_patterns.items()
+        }
+    
+    def _count_failure_indicators(self, company_doc: CompanyDoc) -> int:
+        """Number of stage-specific failure indicators matched"""
+        
+        stage_indicators = self.failure_indicator_words.get(company_doc.stage, [])
+        hits = keyword_hits(company_doc.description, company_doc.team_info)
+        
+        # Check for failure indicators
+        indicator_matches = 0
+        for indicator_words in stage_indicators:
+            if any(word in hits for word in indicator_words):
+                indicator_matches += 1
+        
+        return indicator_matches
+    
+    def _assess_risk_categories(self, category_matches: Dict[str, int]) -> Dict[str, float]:
+        """Assess risk across different categories"""
         
         risk_scores = {}
         
-        for risk_type, risk_data in self.risk_patterns.items():
-            # Check for risk pattern matches
-            matches = sum(1 for pattern in risk_data["patterns"] if pattern in content)
+        for risk_type, matches in category_matches.items():
+            risk_data = self.risk_patterns[risk_type]
             
             if matches > 0:
                 # Risk detected - calculate severity
@@ -103,21 +190,14 @@ class RiskOracleAgent:
         
         return risk_scores
     
-    def _assess_failure_indicators(self, company_doc: CompanyDoc) -> float:
+    def _assess_failure_indicators(self, company_doc: CompanyDoc, indicator_matches: int) -> float:
         """Assess stage-specific failure indicators"""
         
-        stage_indicators = self.failure_indicators.get(company_doc.stage, [])
-        content = (company_doc.description + " " + (company_doc.team_info or "")).lower()
-        
-        # Check for failure indicators
-        indicator_matches = 0
-        for indicator in stage_indicators:
-            if any(word in content for word in indicator.split()):
-                indicator_matches += 1
+        indicator_count = len(self.failure_indicator_words.get(company_doc.stage, []))
         
         # Calculate failure risk (0 = no risk, 1 = high risk)
-        if len(stage_indicators) > 0:
-            failure_risk = indicator_matches / len(stage_indicators)
+        if indicator_count > 0:
+            failure_risk = indicator_matches / indicator_count
         else:
             failure_risk = 0.2  # Default baseline
         
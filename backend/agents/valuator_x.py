@@ -1,14 +1,18 @@
 import asyncio
 import math
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from ..models import CompanyDoc, AgentScore
+from .batch import score_groups
+from .keywords import keyword_hits, keyword_hits_batch, register_patterns
 
 class ValuatorXAgent:
     """Valuation-band estimator via market and traction alignment"""
     
     def __init__(self):
         self.name = "valuator_x"
+        self.version = "2"
+        self.input_fields = ("description", "business_model", "financials", "stage")
         
         # Market valuation multiples by industry and stage
         self.valuation_multiples = {
@@ -50,15 +54,147 @@ class ValuatorXAgent:
             7: {"min": 10000000, "max": 100000000, "median": 30000000}, # Turnaround
             8: {"min": 100000000, "max": 10000000000, "median": 500000000} # Pre-exit
         }
+        
+        # Industry detection patterns, checked in priority order
+        self.industry_keywords = [
+            ("saas", ["saas", "software", "subscription"]),
+            ("marketplace", ["marketplace", "platform", "connect"]),
+            ("fintech", ["fintech", "financial", "payments", "banking"]),
+            ("healthtech", ["health", "medical", "healthcare", "biotech"])
+        ]
+        register_patterns(term for _, terms in self.industry_keywords for term in terms)
     
     async def evaluate(self, company_doc: CompanyDoc) -> AgentScore:
         """Estimate valuation band and score alignment"""
         
-        # Identify industry and stage category
-        industry = self._identify_industry(company_doc)
-        stage_category = self._get_stage_category(company_doc.stage)
+        # Identify industry
+        return self._score(company_doc, self._identify_industry(company_doc))
+    
+    def score_batch(self, company_docs: Sequence[CompanyDoc]) -> List[Optional[AgentScore]]:
+        """Score many companies at once
+        
+        Produces exactly the scores of ``evaluate``. Industries come from
+        one keyword scan over the whole batch and the valuation arithmetic
+        runs in NumPy; companies with the same estimates, stage and
+        financials flag share a score, so each combination is built once.
+        Metrics float64 can't hold exactly are left to the scalar path.
+        Entries are None where ``evaluate`` would raise.
+        """
+        import numpy as np
+        
+        if not company_docs:
+            return []
+        
+        count = len(company_docs)
+        methods = ["revenue_multiple", "gmv_multiple", "user_multiple", "stage_based"]
+        
+        # First industry in priority order with a matching term, else the default
+        hits = keyword_hits_batch(
+            [company_doc.description for company_doc in company_docs],
+            [company_doc.business_model for company_doc in company_docs]
+        )
+        industries = [industry for industry, _ in self.industry_keywords] + ["default"]
+        industry_index = np.column_stack(
+            [hits.any(terms) for _, terms in self.industry_keywords] + [np.ones(count, dtype=bool)]
+        ).argmax(axis=1)
+        
+        # Multiples per (industry, stage) and min/max/median bands per stage
+        stages = np.array([company_doc.stage for company_doc in company_docs], dtype=np.int64)
+        stage_range = range(max(self.stage_expectations) + 1)
+        multiple_table = np.array([
+            [
+                [multiples["revenue"], multiples["gmv"], multiples["users"]]
+                for multiples in (self.valuation_multiples[industry][self._get_stage_category(stage)] for stage in stage_range)
+            ]
+            for industry in industries
+        ])
+        band_table = np.array([
+            [stage_data["min"], stage_data["max"], stage_data["median"]]
+            for stage_data in (self.stage_expectations.get(stage, self.stage_expectations[3]) for stage in stage_range)
+        ])
+        multiples = multiple_table[industry_index, stages]
+        band_min, band_max, band_median = band_table[stages].T
+        
+        # Raw metrics (NaN = not reported)
+        metrics = np.full((count, 3), np.nan)
+        revenue_factor = np.ones(count)
+        scalar_rows = np.zeros(count, dtype=bool)
+        for row, company_doc in enumerate(company_docs):
+            financials = company_doc.financials
+            if not financials:
+                continue
+            
+            values = [None, None, None]
+            if "revenue" in financials or "arr" in financials or "mrr" in financials:
+                values[0] = financials.get("revenue", 0)
+                if "arr" in financials:
+                    values[0] = financials["arr"]
+                elif "mrr" in financials:
+                    values[0] = financials["mrr"]
+                    revenue_factor[row] = 12
+            if "gmv" in financials:
+                values[1] = financials["gmv"]
+            if "users" in financials or "customers" in financials:
+                values[2] = financials.get("users", financials.get("customers", 0))
+            
+            for column, value in enumerate(values):
+                # Ints below 2**43 stay exact through the x12 and multiple products
+                if value is None:
+                    continue
+                if isinstance(value, float) or (isinstance(value, int) and abs(value) < 2 ** 43):
+                    metrics[row, column] = value
+                else:
+                    scalar_rows[row] = True
+        
+        # Same operation order as the scalar path, so floats match bit for bit
+        metrics[:, 0] *= revenue_factor
+        with np.errstate(invalid="ignore"):
+            estimates = np.where(metrics > 0, metrics * multiples, np.nan)
+        
+        # Stage-based fallback when no metric produced an estimate
+        no_metrics = np.isnan(estimates).all(axis=1)
+        estimates = np.column_stack([estimates, np.where(no_metrics, band_median, np.nan)])
+        
+        valid_counts = (estimates > 0).sum(axis=1)
+        ordered = np.sort(estimates, axis=1)  # NaNs sort last
+        median_estimate = ordered[np.arange(count), valid_counts // 2]
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            within_band = (band_min <= median_estimate) & (median_estimate <= band_max)
+            near_median = np.abs(median_estimate - band_median) / band_median < 0.5
+            scores = np.select(
+                [valid_counts == 0, within_band & near_median, within_band, median_estimate < band_min],
+                [0.3, 0.9, 0.7, np.maximum(0.5 * (median_estimate / band_min), 0.2)],
+                default=np.maximum(0.4 * (band_max / median_estimate), 0.1)
+            )
+        
+        scalar_row_list = scalar_rows.tolist()
+        industry_list = industry_index.tolist()
+        estimate_list = estimates.tolist()
+        score_list = scores.tolist()
+        
+        def score(row: int) -> AgentScore:
+            if scalar_row_list[row]:
+                return self._score(company_docs[row], industries[industry_list[row]])
+            
+            valuation_estimates = {
+                method: estimate for method, estimate in zip(methods, estimate_list[row]) if not math.isnan(estimate)
+            }
+            return self._build_score(company_docs[row], valuation_estimates, score_list[row])
+        
+        keys = np.column_stack([
+            np.where(scalar_rows, np.arange(1, count + 1), 0),  # scalar rows are scored alone
+            stages,
+            [bool(company_doc.financials) for company_doc in company_docs],
+            np.nan_to_num(estimates, nan=0.0)
+        ])
+        return score_groups(keys, score)
+    
+    def _score(self, company_doc: CompanyDoc, industry: str) -> AgentScore:
+        """Score a company whose industry is known"""
         
         # Calculate valuation estimates
+        stage_category = self._get_stage_category(company_doc.stage)
         valuation_estimates = self._calculate_valuations(company_doc, industry, stage_category)
         
         # Assess valuation reasonableness
@@ -66,6 +202,13 @@ class ValuatorXAgent:
             company_doc.stage, valuation_estimates
         )
         
+        return self._build_score(company_doc, valuation_estimates, valuation_score)
+    
+    def _build_score(
+        self, company_doc: CompanyDoc, valuation_estimates: Dict[str, Optional[float]], valuation_score: float
+    ) -> AgentScore:
+        """Assemble the AgentScore shared by the scalar and batch paths"""
+        
         # Generate valuation insights
         insights = self._generate_valuation_insights(
             company_doc, valuation_estimates, valuation_score
@@ -83,19 +226,13 @@ class ValuatorXAgent:
     def _identify_industry(self, company_doc: CompanyDoc) -> str:
         """Identify industry from company description"""
         
-        description = (company_doc.description + " " + (company_doc.business_model or "")).lower()
-        
-        # Industry detection patterns
-        if any(term in description for term in ["saas", "software", "subscription"]):
-            return "saas"
-        elif any(term in description for term in ["marketplace", "platform", "connect"]):
-            return "marketplace"
-        elif any(term in description for term in ["fintech", "financial", "payments", "banking"]):
-            return "fintech"
-        elif any(term in description for term in ["health", "medical", "healthcare", "biotech"]):
-            return "healthtech"
-        else:
-            return "default"
+        hits = keyword_hits(company_doc.description, company_doc.business_model)
+        
+        for industry, terms in self.industry_keywords:
+            if any(term in hits for term in terms):
+                return industry
+        
+        return "default"
     
     def _get_stage_category(self, stage: int) -> str:
         """Map lifecycle stage to valuation category"""
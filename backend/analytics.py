@@ -0,0 +1,250 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Engine
+
+from .database import Company, Evaluation, engine
+
+ANALYTICS_PATH = os.getenv("ANALYTICS_PATH", "analytics")
+# created_at is stamped before the row commits, so each export re-reads this window
+ANALYTICS_EXPORT_LOOKBACK = float(os.getenv("ANALYTICS_EXPORT_LOOKBACK", "3600"))
+AGENT_PREFIX = "agent_"
+PERCENTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+HISTOGRAM_BINS = np.linspace(0.0, 1.0, 11)
+
+class EvaluationAnalytics:
+    """Columnar copy of the evaluations table for statistics
+
+    ``export`` appends evaluations not yet exported as Parquet parts,
+    flattening the ``agent_scores`` JSON into one ``agent_<name>`` column
+    per agent and adding the company's stage (from the `companies` row
+    saved with each evaluation; NULL for evaluations without one), so
+    statistics never parse JSON blobs.
+
+    ``created_at`` is stamped before an evaluation commits, so a row can
+    commit behind evaluations already exported. Each export re-reads
+    ``lookback`` seconds before the newest exported ``created_at`` and
+    skips the ids already written (kept with the watermark); only rows
+    committing more than ``lookback`` late are missed.
+
+    Parts are compacted once there are ``max_parts`` of them. ``summary``
+    reads the store once (cached until the files change) and computes
+    everything with vectorized pandas/NumPy operations.
+    """
+
+    def __init__(
+        self,
+        bind: Engine = engine,
+        path: str = ANALYTICS_PATH,
+        chunk_size: int = 10000,
+        max_parts: int = 16,
+        lookback: float = ANALYTICS_EXPORT_LOOKBACK
+    ):
+        self.bind = bind
+        self.path = path
+        self.lookback = timedelta(seconds=lookback)
+        self.chunk_size = chunk_size
+        self.max_parts = max_parts
+        self._lock = threading.Lock()
+        self._frame: Optional[pd.DataFrame] = None
+        self._frame_version: Optional[Tuple] = None
+
+    def export(self) -> int:
+        """Append evaluations written since the last export; returns rows exported"""
+        os.makedirs(self.path, exist_ok=True)
+        watermark, recent = self._read_watermark()
+        exported = 0
+        cursor = None
+
+        while True:
+            query = (
+                select(
+                    Evaluation.evaluation_id, Evaluation.company_id, Evaluation.user_id, Evaluation.verdict,
+                    Evaluation.overall_score, Evaluation.agent_scores, Evaluation.created_at, Company.stage
+                )
+                .outerjoin(Company, Company.company_id == Evaluation.company_id)
+                .order_by(Evaluation.created_at, Evaluation.evaluation_id)
+                .limit(self.chunk_size)
+            )
+            if cursor is not None:
+                query = query.where(tuple_(Evaluation.created_at, Evaluation.evaluation_id) > tuple_(*cursor))
+            elif watermark is not None:
+                query = query.where(Evaluation.created_at >= watermark - self.lookback)
+
+            page = pd.read_sql(query, self.bind)
+            if page.empty:
+                break
+            page["created_at"] = pd.to_datetime(page["created_at"])
+            last = page.iloc[-1]
+            cursor = (last["created_at"].to_pydatetime(), last["evaluation_id"])
+
+            frame = page[~page["evaluation_id"].isin(recent)]
+            if not frame.empty:
+                frame = self._flatten(frame)
+                self._write(frame, f"part-{datetime.utcnow():%Y%m%d%H%M%S%f}-{len(frame)}.parquet")
+
+                newest = frame["created_at"].max().to_pydatetime()
+                watermark = newest if watermark is None else max(watermark, newest)
+                recent.update(zip(frame["evaluation_id"], (moment.to_pydatetime() for moment in frame["created_at"])))
+                recent = {key: moment for key, moment in recent.items() if moment >= watermark - self.lookback}
+                self._write_watermark(watermark, recent)
+                exported += len(frame)
+
+            if len(page) < self.chunk_size:
+                break
+
+        if len(self._parts()) >= self.max_parts:
+            self.compact()
+        return exported
+
+    def compact(self):
+        """Merge all parts into one file"""
+        parts = self._parts()
+        if len(parts) < 2:
+            return
+
+        frame = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+        self._write(frame, f"compacted-{datetime.utcnow():%Y%m%d%H%M%S%f}.parquet")
+        for part in parts:
+            os.remove(part)
+
+    def load(self) -> pd.DataFrame:
+        """All exported evaluations (cached until the files change)"""
+        parts = self._parts()
+        version = tuple((part, os.path.getmtime(part)) for part in parts)
+
+        with self._lock:
+            if self._frame is None or version != self._frame_version:
+                frames = [pd.read_parquet(part) for part in parts]
+                if frames:
+                    # A part written just before a crash may be exported again
+                    frame = pd.concat(frames, ignore_index=True).drop_duplicates("evaluation_id", keep="last")
+                else:
+                    frame = pd.DataFrame(
+                        columns=["evaluation_id", "company_id", "user_id", "verdict", "overall_score", "created_at", "stage"]
+                    )
+                self._frame = frame
+                self._frame_version = version
+            return self._frame
+
+    def summary(
+        self,
+        stage: Optional[int] = None,
+        verdict: Optional[str] = None,
+        since: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Percentiles, histograms and agent correlations over the columnar store"""
+        frame = self.load()
+        mask = np.ones(len(frame), dtype=bool)
+        if stage is not None:
+            mask &= (frame["stage"] == stage).fillna(False).to_numpy(dtype=bool)
+        if verdict is not None:
+            mask &= (frame["verdict"] == verdict).to_numpy(dtype=bool)
+        if since is not None:
+            mask &= (frame["created_at"] >= pd.Timestamp(since)).to_numpy(dtype=bool)
+        frame = frame[mask]
+
+        agents = sorted(column for column in frame.columns if column.startswith(AGENT_PREFIX))
+        scores = frame[["overall_score", *agents]].astype(float)
+
+        return {
+            "count": int(len(frame)),
+            "percentiles": self._percentiles(scores),
+            "histograms": {
+                column: np.histogram(scores[column].dropna().to_numpy(), bins=HISTOGRAM_BINS)[0].tolist()
+                for column in scores.columns
+            },
+            "histogram_bins": HISTOGRAM_BINS.round(2).tolist(),
+            "by_stage_verdict": self._by_stage_verdict(frame),
+            "verdicts": {verdict: int(count) for verdict, count in frame["verdict"].value_counts().items()},
+            "agent_correlation": self._nan_to_none(scores[agents].corr().round(4)) if agents else {}
+        }
+
+    @staticmethod
+    def _flatten(frame: pd.DataFrame) -> pd.DataFrame:
+        agent_scores = frame.pop("agent_scores").map(
+            lambda value: json.loads(value) if isinstance(value, str) else (value or {})
+        )
+        agents = pd.DataFrame.from_records(agent_scores.tolist(), index=frame.index).add_prefix(AGENT_PREFIX)
+        frame = pd.concat([frame, agents.astype(float)], axis=1)
+        frame["created_at"] = pd.to_datetime(frame["created_at"])
+        frame["stage"] = frame["stage"].astype("Int64")
+        return frame
+
+    def _percentiles(self, scores: pd.DataFrame) -> Dict[str, Dict[str, Optional[float]]]:
+        if scores.empty:
+            return {}
+        quantiles = scores.quantile(PERCENTILES)
+        quantiles.index = [f"p{int(q * 100)}" for q in PERCENTILES]
+        return self._nan_to_none(quantiles.round(4))
+
+    @staticmethod
+    def _by_stage_verdict(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        if frame.empty:
+            return []
+        # agg rather than describe(): describe() can't group a stage column mixing NULL and values
+        grouped = frame.groupby(["stage", "verdict"], dropna=False)["overall_score"]
+        stats = grouped.agg(["count", "mean", "median"]).reset_index()
+        return [
+            {
+                "stage": int(row["stage"]) if pd.notna(row["stage"]) else None,
+                "verdict": row["verdict"],
+                "count": int(row["count"]),
+                "mean": round(float(row["mean"]), 4),
+                "median": round(float(row["median"]), 4)
+            }
+            for _, row in stats.iterrows()
+        ]
+
+    @staticmethod
+    def _nan_to_none(frame: pd.DataFrame) -> Dict[str, Dict[str, Optional[float]]]:
+        return {
+            column: {index: (None if pd.isna(value) else float(value)) for index, value in values.items()}
+            for column, values in frame.to_dict().items()
+        }
+
+    def _parts(self) -> List[str]:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith(".parquet")
+        )
+
+    def _write(self, frame: pd.DataFrame, name: str):
+        path = os.path.join(self.path, name)
+        frame.to_parquet(f"{path}.tmp", compression="zstd", index=False)
+        os.replace(f"{path}.tmp", path)
+
+    def _read_watermark(self) -> Tuple[Optional[datetime], Dict[str, datetime]]:
+        """Newest exported created_at, and the ids exported within the lookback window before it"""
+        path = os.path.join(self.path, "_watermark.json")
+        if not os.path.exists(path):
+            return None, {}
+        with open(path) as f:
+            state = json.load(f)
+        if isinstance(state, list):
+            # Stores written before the lookback window: [created_at, evaluation_id]
+            created_at = datetime.fromisoformat(state[0])
+            return created_at, {state[1]: created_at}
+        recent = {key: datetime.fromisoformat(moment) for key, moment in state["recent"].items()}
+        return datetime.fromisoformat(state["created_at"]), recent
+
+    def _write_watermark(self, watermark: datetime, recent: Dict[str, datetime]):
+        path = os.path.join(self.path, "_watermark.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump({
+                "created_at": watermark.isoformat(),
+                "recent": {key: moment.isoformat() for key, moment in recent.items()}
+            }, f)
+        os.replace(f"{path}.tmp", path)
+
+evaluation_analytics = EvaluationAnalytics()
+
+if __name__ == "__main__":
+    print(f"Exported {evaluation_analytics.export()} evaluations")
@@ -0,0 +1,136 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from .database import AsyncSessionLocal, AuditLog
+
+class AuditSink:
+    """Buffered AuditLog writer
+
+    Request handlers only enqueue a row; a background task drains the
+    buffer and writes it as multi-row INSERTs, flushing whenever
+    ``batch_size`` rows are waiting or ``flush_interval`` seconds have
+    passed since the first buffered row. When the buffer holds
+    ``max_buffer`` rows, ``record`` waits (backpressure) instead of growing
+    without bound. ``stop`` drains and writes everything still queued.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = AsyncSessionLocal,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        max_attempts: int = 3
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_attempts = max_attempts
+
+        self.written = 0
+        self.dropped = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the background flusher (call once the event loop is running)"""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_buffer)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything buffered, then stop the background flusher"""
+        if self._task is None:
+            return
+
+        await self._queue.put(None)  # Sentinel: drain and exit
+        await self._task
+        self._task = None
+
+    async def record(
+        self,
+        action: str,
+        user_id: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ):
+        """Enqueue one audit row, waiting only if the buffer is full"""
+        if self._task is None:
+            raise RuntimeError("AuditSink is not running; call start() first")
+
+        await self._queue.put({
+            "log_id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "metadata": metadata,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": datetime.utcnow()
+        })
+
+    @property
+    def buffered(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            row = await self._queue.get()
+            if row is None:
+                break
+
+            batch = [row]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                try:
+                    # Take whatever is already buffered, then wait out the interval
+                    row = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._write(batch)
+
+    async def _write(self, rows: List[Dict[str, Any]]):
+        """Multi-row INSERT with retries; a batch is dropped only after max_attempts"""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(insert(AuditLog.__table__), rows)
+                    await session.commit()
+                self.written += len(rows)
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.dropped += len(rows)
+                    print(f"Audit log write failed, dropped {len(rows)} rows: {e}")
+                    return
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+    def stats(self) -> Dict[str, int]:
+        return {"buffered": self.buffered, "written": self.written, "dropped": self.dropped}
+
+audit_sink = AuditSink()
@@ -0,0 +1,248 @@
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import and_, delete, func, select, text
+from sqlalchemy.engine import Engine
+
+from .database import AuditLog, engine
+
+# Old months leave the hot table for one compressed Parquet file each. The
+# archive is the only copy once a month is dropped: keep it on persistent storage
+AUDIT_ARCHIVE_PATH = os.getenv("AUDIT_ARCHIVE_PATH", "audit_archive")
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", "3"))
+AUDIT_PARTITIONS_AHEAD = 2
+
+_ARCHIVE_FILE_RE = re.compile(r"^audit_logs_(\d{4})_(\d{2})\.parquet$")
+_PARTITION_RE = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+_COLUMNS = [column.name for column in AuditLog.__table__.columns]
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def _partition_name(month: datetime) -> str:
+    return f"audit_logs_y{month.year:04d}m{month.month:02d}"
+
+def _is_partitioned(bind: Engine) -> bool:
+    return bind.dialect.name == "postgresql"
+
+def _fsync(path: str):
+    """Flush a file, or a directory's entries, to disk"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class AuditArchive:
+    """Monthly time partitions for `audit_logs` plus a Parquet archive
+
+    On PostgreSQL the table is range-partitioned by ``created_at`` (one
+    partition per month, created ahead of time, with a default partition
+    as a safety net). ``archive`` exports every month older than the
+    retention window to ``audit_logs_YYYY_MM.parquet`` (zstd-compressed,
+    ``metadata`` kept as JSON text) and then drops the partition - or
+    deletes the month's rows on databases without partitioning. Rows are
+    only dropped once the file is synced to disk and read back with every
+    exported row, and only if the drop removes exactly those rows. Only
+    recent months stay in the hot table and its indexes; ``query`` reads
+    the hot table first and falls back to the archive, newest month
+    first, with filters pushed down into the Parquet reader.
+    """
+
+    def __init__(
+        self,
+        bind: Engine = engine,
+        path: str = AUDIT_ARCHIVE_PATH,
+        retention_months: int = AUDIT_RETENTION_MONTHS
+    ):
+        self.bind = bind
+        self.path = path
+        self.retention_months = retention_months
+
+    def ensure_partitions(self, now: Optional[datetime] = None):
+        """Create this month's partition and the next few (PostgreSQL only)"""
+        if not _is_partitioned(self.bind):
+            return
+
+        month = _month_start(now or datetime.utcnow())
+        with self.bind.begin() as conn:
+            conn.execute(text("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT"))
+            for offset in range(AUDIT_PARTITIONS_AHEAD + 1):
+                start = _add_months(month, offset)
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {_partition_name(start)} PARTITION OF audit_logs "
+                    f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{_add_months(start, 1):%Y-%m-%d}')"
+                ))
+
+    def archive(self, now: Optional[datetime] = None) -> List[str]:
+        """Move every month older than the retention window into Parquet; returns the months archived"""
+        cutoff = _add_months(_month_start(now or datetime.utcnow()), -self.retention_months)
+        archived = []
+
+        for month in self._months_before(cutoff):
+            end = _add_months(month, 1)
+            frame = pd.read_sql(
+                select(AuditLog.__table__).where(and_(AuditLog.created_at >= month, AuditLog.created_at < end)),
+                self.bind
+            )
+            if not frame.empty:
+                self._verify(self._write_month(month, frame), frame)
+
+            with self.bind.begin() as conn:
+                partition = _partition_name(month)
+                if _is_partitioned(self.bind) and partition in self._partitions(conn):
+                    conn.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {partition}"))
+                    removed = conn.execute(text(f"SELECT count(*) FROM {partition}")).scalar()
+                    self._check_removed(month, removed, frame)
+                    conn.execute(text(f"DROP TABLE {partition}"))
+                else:
+                    removed = conn.execute(
+                        delete(AuditLog).where(and_(AuditLog.created_at >= month, AuditLog.created_at < end))
+                    ).rowcount
+                    self._check_removed(month, removed, frame)
+
+            archived.append(f"{month:%Y-%m}")
+            print(f"Archived {len(frame)} audit rows for {month:%Y-%m}")
+
+        return archived
+
+    def query(
+        self,
+        user_id: Optional[str] = None,
+        action: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Audit rows newest first, from the hot table and then the archive"""
+        filters = {"user_id": user_id, "action": action, "resource_type": resource_type, "resource_id": resource_id}
+        filters = {column: value for column, value in filters.items() if value is not None}
+
+        conditions = [AuditLog.__table__.c[column] == value for column, value in filters.items()]
+        if start is not None:
+            conditions.append(AuditLog.created_at >= start)
+        if end is not None:
+            conditions.append(AuditLog.created_at < end)
+
+        with self.bind.connect() as conn:
+            rows = [
+                dict(row)
+                for row in conn.execute(
+                    select(AuditLog.__table__).where(*conditions).order_by(AuditLog.created_at.desc()).limit(limit)
+                ).mappings()
+            ]
+
+        # Archived months are all older than anything still in the hot table
+        for month, path in self._archive_files(newest_first=True):
+            if len(rows) >= limit:
+                break
+            if start is not None and _add_months(month, 1) <= start:
+                break
+            if end is not None and month >= end:
+                continue
+
+            predicates = [(column, "==", value) for column, value in filters.items()]
+            if start is not None:
+                predicates.append(("created_at", ">=", pd.Timestamp(start)))
+            if end is not None:
+                predicates.append(("created_at", "<", pd.Timestamp(end)))
+
+            frame = pd.read_parquet(path, filters=predicates or None)
+            frame = frame.sort_values("created_at", ascending=False).head(limit - len(rows))
+            rows.extend(self._from_frame(frame))
+
+        return rows[:limit]
+
+    def _months_before(self, cutoff: datetime) -> Iterator[datetime]:
+        with self.bind.connect() as conn:
+            oldest = conn.execute(select(func.min(AuditLog.created_at)).where(AuditLog.created_at < cutoff)).scalar()
+        if oldest is None:
+            return
+
+        month = _month_start(oldest)
+        while month < cutoff:
+            yield month
+            month = _add_months(month, 1)
+
+    def _partitions(self, conn) -> set:
+        return set(conn.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'audit_logs'"
+        )).scalars())
+
+    def _archive_files(self, newest_first: bool = False) -> List[Tuple[datetime, str]]:
+        if not os.path.isdir(self.path):
+            return []
+
+        files = []
+        for name in os.listdir(self.path):
+            match = _ARCHIVE_FILE_RE.match(name)
+            if match:
+                files.append((datetime(int(match.group(1)), int(match.group(2)), 1), os.path.join(self.path, name)))
+        return sorted(files, reverse=newest_first)
+
+    def _write_month(self, month: datetime, frame: pd.DataFrame) -> str:
+        """Write (or merge into) a month's Parquet file, atomically and durably; returns its path"""
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, f"audit_logs_{month:%Y_%m}.parquet")
+
+        frame = frame[_COLUMNS].copy()
+        frame["metadata"] = frame["metadata"].map(
+            lambda value: value if value is None or isinstance(value, str) else json.dumps(value)
+        )
+        frame["created_at"] = pd.to_datetime(frame["created_at"])
+        if os.path.exists(path):
+            frame = pd.concat([pd.read_parquet(path), frame]).drop_duplicates("log_id", keep="last")
+
+        # Sorted by time so row-group statistics let readers skip most of the file
+        frame = frame.sort_values("created_at")
+        temporary = f"{path}.tmp"
+        frame.to_parquet(temporary, compression="zstd", index=False)
+        _fsync(temporary)
+        os.replace(temporary, path)
+        _fsync(self.path)
+        return path
+
+    @staticmethod
+    def _verify(path: str, frame: pd.DataFrame):
+        """Read the written file back; raise unless it holds every exported row"""
+        missing = set(frame["log_id"]) - set(pd.read_parquet(path, columns=["log_id"])["log_id"])
+        if missing:
+            raise RuntimeError(f"{path} is missing {len(missing)} of {len(frame)} exported audit rows")
+
+    @staticmethod
+    def _check_removed(month: datetime, removed: int, frame: pd.DataFrame):
+        """Roll the drop back if it would remove rows that weren't exported (written since the read)"""
+        if removed != len(frame):
+            raise RuntimeError(
+                f"Audit month {month:%Y-%m} has {removed} rows but {len(frame)} were archived; "
+                "kept in the database until the next run"
+            )
+
+    @staticmethod
+    def _from_frame(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        rows = []
+        for record in frame.to_dict("records"):
+            record["created_at"] = record["created_at"].to_pydatetime()
+            if isinstance(record.get("metadata"), str):
+                record["metadata"] = json.loads(record["metadata"])
+            rows.append(record)
+        return rows
+
+audit_archive = AuditArchive()
+
+if __name__ == "__main__":
+    audit_archive.ensure_partitions()
+    print(f"Archived months: {audit_archive.archive() or 'none'}")
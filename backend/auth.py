@@ -1,26 +1,37 @@
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from typing import Any, Optional, Dict
 import os
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from .database import AsyncSessionLocal, User
+from .passwords import password_service
+from .token_cache import TokenCache
+from .user_cache import user_cache
 
 # Security setup
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+token_cache = TokenCache(
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "10000")),
+    max_ttl=float(os.getenv("TOKEN_CACHE_TTL", "300"))
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash (blocking; async code uses password_service)"""
+    return password_service.verify_sync(plain_password, hashed_password)[0]
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+    """Hash a password (blocking; async code uses password_service)"""
+    return password_service.hash_sync(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -30,7 +41,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # Float iat so a token issued right after revoke_user() is still accepted
+    to_encode.update({"exp": expire, "iat": time.time()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -38,28 +50,109 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
     """Verify JWT token and return payload"""
     token = credentials.credentials
     
+    # Hits skip signature verification; entries expire no later than the token
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
-        
-        return {"user_id": user_id, "email": payload.get("email")}
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    if token_cache.is_revoked(token, user_id, payload.get("iat")):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    
+    claims = {"user_id": user_id, "email": payload.get("email")}
+    if payload.get("exp") is not None:
+        token_cache.set(token, claims, float(payload["exp"]), payload.get("iat"))
+    return claims
+
+def revoke_token(token: str):
+    """Reject a token from now on, even if it is cached"""
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        exp = None
+    token_cache.revoke_token(token, float(exp) if exp is not None else None)
+
+def revoke_user_tokens(user_id: str):
+    """Reject every token issued to a user so far"""
+    token_cache.revoke_user(user_id)
+
+async def load_user(user_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a user's account fields from the database"""
+    async with AsyncSessionLocal() as session:
+        user = await session.get(User, user_id)
+        if user is None:
+            return None
+        return {
+            "user_id": user.user_id,
+            "email": user.email,
+            "user_type": user.user_type,
+            "tier": user.tier or "free",
+            "reports_this_month": user.reports_this_month or 0,
+            "privacy_preferences": user.privacy_preferences or {},
+            "is_active": user.is_active is not False
+        }
 
 async def get_current_user(token_data: dict = Depends(verify_token)) -> dict:
-    """Get current user from token"""
-    # In production, fetch user from database
-    # For now, return token data
-    return token_data
+    """Get current user from token, resolved through the user cache"""
+    user = await user_cache.get(token_data["user_id"], load_user)
+    if user is None:
+        # Demo accounts only exist in the token, so they keep its claims; any other
+        # unknown id is a deleted account whose token is still unexpired
+        if not any(demo["user_id"] == token_data["user_id"] for demo in USERS_DB.values()):
+            raise HTTPException(status_code=401, detail="Unknown user")
+        return token_data
+    if not user["is_active"]:
+        raise HTTPException(status_code=403, detail="Inactive user")
+    return user
+
+async def authenticate_user(email: str, password: str) -> Optional[Dict[str, Any]]:
+    """Check credentials off the event loop, upgrading outdated hashes on success"""
+    demo_user = USERS_DB.get(email)
+    try:
+        async with AsyncSessionLocal() as session:
+            user = (await session.execute(select(User).where(User.email == email))).scalar_one_or_none()
+            if user is not None:
+                valid, new_hash = await password_service.verify(password, user.hashed_password)
+                if not valid:
+                    return None
+                authenticated = {"user_id": user.user_id, "email": user.email, "user_type": user.user_type, "tier": user.tier}
+                if new_hash:
+                    try:
+                        user.hashed_password = new_hash
+                        await session.commit()
+                    except SQLAlchemyError as e:
+                        # The old hash still verifies; the upgrade is retried next login
+                        print(f"Password hash upgrade failed for {user.user_id}: {e}")
+                return authenticated
+    except (SQLAlchemyError, OSError) as e:
+        print(f"User lookup failed during login: {e}")
+        # Demo accounts don't need the database; anyone else can't be checked right now
+        if demo_user is None:
+            raise HTTPException(status_code=503, detail="Authentication temporarily unavailable")
+    
+    if demo_user is None:
+        return None
+    valid, new_hash = await password_service.verify(password, demo_user["hashed_password"])
+    if not valid:
+        return None
+    if new_hash:
+        demo_user["hashed_password"] = new_hash
+    return {key: value for key, value in demo_user.items() if key != "hashed_password"}
 
-# Mock user database - replace with real database
+# Mock user database - replace with real database.
+# The hash is precomputed ("testpassword", cost 12) so importing doesn't run bcrypt.
 USERS_DB = {
     "test@example.com": {
         "user_id": "user-123",
         "email": "test@example.com",
-        "hashed_password": get_password_hash("testpassword"),
+        "hashed_password": "$2b$12$pkwzq/pQdbRqAZXwhlE/K.5ynDZiWTydmWEy6II1VKxgxWmIXcBl2",
         "user_type": "founder",
         "tier": "free"
     }
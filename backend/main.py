@@ -1,8 +1,24 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import asyncio
+import json
 import os
 
+from .agents import AgentOrchestrator
+from .audit import audit_sink
+from .auth import authenticate_user, create_access_token, get_current_user, token_cache
+from .database import async_engine, get_db, pool_status
+from .models import CompanyDoc
+from .passwords import password_service
+from .repository import DashboardRepository, EvaluationRepository, save_evaluation
+from .user_cache import user_cache
+from .worker import get_evaluation_status, submit_evaluation
+
 app = FastAPI(title="AXIVAI API", version="1.0.0")
+orchestrator = AgentOrchestrator()
 
 # CORS middleware
 app.add_middleware(
@@ -21,17 +37,169 @@ async def root():
 async def health():
     return {"status": "healthy", "service": "AXIVAI Backend"}
 
+@app.get("/health/db")
+async def health_db():
+    return {"status": "healthy", "pool": pool_status()}
+
+@app.get("/health/cache")
+async def health_cache():
+    return {"status": "healthy", "token_cache": token_cache.stats(), "user_cache": user_cache.stats()}
+
+@app.on_event("startup")
+async def startup():
+    await audit_sink.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Flush buffered audit rows before the pool goes away
+    await audit_sink.stop()
+    await async_engine.dispose()
+    password_service.shutdown()
+
+async def audit(request: Request, action: str, **fields):
+    """Enqueue an audit row for this request (no DB round-trip)"""
+    await audit_sink.record(
+        action,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+        **fields
+    )
+
 @app.post("/api/auth/login")
-async def login(credentials: dict):
-    # Simple demo login
-    if credentials.get("email") == "test@example.com" and credentials.get("password") == "testpassword":
-        return {"access_token": "demo-token", "token_type": "bearer", "user": {"email": "test@example.com"}}
+async def login(credentials: dict, request: Request):
+    # Hashing runs on the password pool, so a login burst doesn't stall other requests
+    user = await authenticate_user(credentials.get("email") or "", credentials.get("password") or "")
+    if user is not None:
+        await audit(request, "login", user_id=user["user_id"], metadata={"email": user["email"]})
+        token = create_access_token({"sub": user["user_id"], "email": user["email"]})
+        return {"access_token": token, "token_type": "bearer", "user": {"email": user["email"]}}
+    await audit(request, "login_failed", metadata={"email": credentials.get("email")})
     return {"error": "Invalid credentials"}
 
 @app.get("/api/user/profile")
-async def get_profile():
+async def get_profile(request: Request):
+    await audit(request, "profile_read", resource_type="user")
     return {"email": "test@example.com", "name": "Demo User"}
 
+@app.get("/api/user/dashboard")
+async def get_dashboard(current_user: dict = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+    """Dashboard counters and recent evaluations from the precomputed aggregates row"""
+    stats = await DashboardRepository(db).get(current_user["user_id"])
+    return {
+        "evaluations_count": stats["evaluations_count"],
+        "recent_evaluations": stats["recent_evaluations"],
+        "usage_stats": {
+            "reports_this_month": stats["reports_this_month"],
+            "tier": current_user.get("tier", "free")
+        }
+    }
+
+@app.get("/api/user/evaluations")
+async def list_user_evaluations(
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """The current user's evaluations, newest first (pass `next_cursor` back for more)"""
+    try:
+        return await EvaluationRepository(db).list_by_user(current_user["user_id"], limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/companies/{company_id}/evaluations")
+async def list_company_evaluations(
+    company_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """The current user's evaluations of a company, newest first"""
+    try:
+        # Scoped to the caller: other users' (and privacy_mode) evaluations are never listed
+        return await EvaluationRepository(db).list_by_company(
+            company_id, limit, cursor, user_id=current_user["user_id"]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/analytics/evaluations")
+async def evaluation_statistics(
+    stage: Optional[int] = None,
+    verdict: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Score percentiles, histograms and agent correlations from the columnar export"""
+    from .analytics import evaluation_analytics  # pandas is only loaded once analytics are requested
+
+    return await asyncio.to_thread(evaluation_analytics.summary, stage, verdict)
+
+@app.post("/api/validate/startup/stream")
+async def validate_startup_stream(company_doc: CompanyDoc, request: Request, current_user: dict = Depends(get_current_user)):
+    """Server-sent events: one `agent_score` per agent as it completes, then `result`"""
+    # The evaluation belongs to the authenticated caller, whatever the body claims
+    user_id = current_user["user_id"]
+    company_doc = company_doc.model_copy(update={"submitted_by": user_id})
+    await audit(request, "evaluation", user_id=user_id, resource_type="company", resource_id=company_doc.id)
+    
+    async def event_stream():
+        async for event in orchestrator.evaluate_stream(company_doc):
+            if event["event"] == "result":
+                data = event["result"].model_dump(mode="json")
+                try:
+                    await save_evaluation(event["result"], user_id, company_doc)
+                except Exception as e:
+                    print(f"Failed to persist evaluation {event['result'].id}: {e}")
+            else:
+                data = {
+                    "agent": event["agent"],
+                    "score": event["score"].model_dump(mode="json") if event["score"] is not None else None,
+                    "running_score": event["running_score"],
+                    "completed": event["completed"],
+                    "total": event["total"]
+                }
+            yield f"event: {event['event']}\ndata: {json.dumps(data)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/evaluations", status_code=202)
+async def enqueue_evaluation(company_doc: CompanyDoc, request: Request, current_user: dict = Depends(get_current_user)):
+    """Queue an evaluation on the worker pool and return its job id"""
+    user_id = current_user["user_id"]
+    company_doc = company_doc.model_copy(update={"submitted_by": user_id})
+    await audit(request, "evaluation", user_id=user_id, resource_type="company", resource_id=company_doc.id)
+    # Publishing talks to the broker synchronously; keep it off the event loop
+    job_id = await asyncio.to_thread(submit_evaluation, company_doc, user_id)
+    return {"job_id": job_id, "status": "queued"}
+
+async def _own_evaluation_status(job_id: str, user_id: str) -> dict:
+    """A job's status, as 404 for anyone but its submitter"""
+    status = await asyncio.to_thread(get_evaluation_status, job_id, user_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+    return status
+
+@app.get("/api/evaluations/{job_id}")
+async def evaluation_status(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Poll a queued evaluation"""
+    return await _own_evaluation_status(job_id, current_user["user_id"])
+
+@app.get("/api/evaluations/{job_id}/result")
+async def evaluation_result(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Fetch a finished evaluation's result"""
+    status = await _own_evaluation_status(job_id, current_user["user_id"])
+    
+    if "result" in status:
+        return status["result"]
+    if "error" in status:
+        raise HTTPException(status_code=500, detail=status["error"])
+    raise HTTPException(status_code=404, detail=f"Evaluation {job_id} is {status['status']}")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
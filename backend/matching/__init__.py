@@ -0,0 +1,27 @@
+import importlib
+
+# Imported on first use: the index modules pull in NumPy, SciPy and scikit-learn
+_EXPORTS = {
+    "InvestorIndex": ".investor_index",
+    "MatchFeedProcessor": ".feed",
+    "ThesisIndex": ".thesis_index",
+    "company_doc_from_row": ".feed",
+    "profile_from_row": ".investor_index"
+}
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+__all__ = [
+    "InvestorIndex",
+    "MatchFeedProcessor",
+    "ThesisIndex",
+    "company_doc_from_row",
+    "profile_from_row"
+]
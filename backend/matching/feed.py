@@ -0,0 +1,258 @@
+import os
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_, select
+
+from ..database import AsyncSessionLocal, Company, Evaluation, Investor, Match, MatchChange
+from ..models import CompanyDoc, InvestorProfile, LifecycleStage, MatchResult
+from .investor_index import InvestorIndex, profile_from_row
+
+MATCHES_PER_STARTUP = int(os.getenv("MATCHES_PER_STARTUP", "20"))
+
+def company_doc_from_row(row: Company) -> CompanyDoc:
+    """CompanyDoc for a `companies` table row"""
+    return CompanyDoc(
+        id=row.company_id,
+        name=row.name or "",
+        stage=LifecycleStage(row.stage or LifecycleStage.IDEATION),
+        description=row.description or "",
+        market_size=row.market_size,
+        business_model=row.business_model,
+        team_info=row.team_info,
+        financials=row.financials or {},
+        submitted_by=row.submitted_by or "",
+        privacy_mode=row.privacy_mode if row.privacy_mode is not None else True
+    )
+
+def _at_stages(stages: Set[int]):
+    """Filter for companies at any of these stages (a NULL stage reads as ideation)"""
+    condition = Company.stage.in_(sorted(stages))
+    if LifecycleStage.IDEATION in stages:
+        condition = or_(condition, Company.stage.is_(None))
+    return condition
+
+def _match_row(result: MatchResult, now: datetime) -> Dict:
+    return {
+        "match_id": f"{result.startup_id}:{result.investor_id}",
+        "startup_id": result.startup_id,
+        "investor_id": result.investor_id,
+        "match_score": result.match_score,
+        "match_reasons": result.match_reasons,
+        "stage_alignment": result.stage_alignment,
+        "domain_alignment": result.domain_alignment,
+        "geographic_alignment": result.geographic_alignment,
+        "thesis_alignment": result.thesis_alignment,
+        "created_at": now
+    }
+
+class MatchFeedProcessor:
+    """Keeps each startup's top-k rows in `matches` current from the change feed
+
+    Writes to investors, companies and evaluations queue ``MatchChange``
+    rows (see ``database._record_match_changes``). Each ``process`` call
+    claims a batch of them and recomputes only what they can affect:
+
+    * a changed company (or a new evaluation of it) gets its top-k
+      recomputed from the investor index;
+    * a changed investor is re-indexed and scored on its own against the
+      startups it can match (its stages and their neighbours) - one pair
+      each, never the full N x M grid. A startup's top-k is recomputed
+      only if the investor was already in it or now beats its weakest
+      match.
+
+    A row that can't be scored (malformed company or investor data) is
+    logged and skipped - the startup keeps its previous matches - so one
+    bad row never stalls the feed.
+
+    Rewritten top-k lists are replaced with batched DELETE/INSERTs in the
+    same transaction that consumes the changes. The index lives in this
+    process and is only updated from the feed, so exactly one process may
+    run it: the worker routes its task to the ``matching`` queue, which is
+    served by a single ``--concurrency=1`` worker.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = AsyncSessionLocal,
+        k: int = MATCHES_PER_STARTUP,
+        batch_size: int = 500,
+        write_batch_size: int = 1000
+    ):
+        self.session_factory = session_factory
+        self.k = k
+        self.batch_size = batch_size
+        self.write_batch_size = write_batch_size
+        self.index: Optional[InvestorIndex] = None
+
+    async def process(self) -> Dict[str, int]:
+        """Consume one batch of changes; returns what was done"""
+        async with self.session_factory() as session:
+            if self.index is None:
+                rows = (await session.execute(select(Investor))).scalars().all()
+                self.index = InvestorIndex(self._profiles(rows)[0])
+
+            changes = (await session.execute(
+                select(MatchChange)
+                .order_by(MatchChange.change_id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+            if not changes:
+                return {"changes": 0, "startups": 0, "matches": 0, "failed": 0}
+
+            investor_ids = {c.entity_id for c in changes if c.entity_type == "investor"}
+            company_ids = {c.entity_id for c in changes if c.entity_type == "company"}
+
+            profiles = await self._reindex(session, investor_ids)
+            affected = set(company_ids)
+            if investor_ids:
+                affected |= await self._startups_affected_by(session, investor_ids, profiles)
+
+            written, failed = await self._rewrite(session, affected)
+
+            # Consumed even if some rows failed: retrying them would only stall the feed
+            await session.execute(
+                delete(MatchChange).where(MatchChange.change_id.in_([c.change_id for c in changes]))
+            )
+            await session.commit()
+            return {"changes": len(changes), "startups": len(affected), "matches": written, "failed": len(failed)}
+
+    @staticmethod
+    def _profiles(rows: Iterable[Investor]) -> Tuple[List[InvestorProfile], Set[str]]:
+        """Profiles for investor rows, plus the ids of rows that aren't valid profiles"""
+        profiles, invalid = [], set()
+        for row in rows:
+            try:
+                profiles.append(profile_from_row(row))
+            except Exception as e:
+                print(f"Match feed: skipping investor {row.investor_id}: {e}")
+                invalid.add(row.investor_id)
+        return profiles, invalid
+
+    async def _reindex(self, session, investor_ids: Set[str]) -> List[InvestorProfile]:
+        """Re-index changed investors; returns the profiles now indexed"""
+        if not investor_ids:
+            return []
+
+        rows = (await session.execute(
+            select(Investor).where(Investor.investor_id.in_(investor_ids))
+        )).scalars().all()
+        profiles, invalid = self._profiles(rows)
+
+        self.index.upsert_many(profiles)
+        # Deleted investors, and ones whose row no longer makes a valid profile
+        for investor_id in investor_ids - {profile.id for profile in profiles}:
+            self.index.remove(investor_id)
+        return profiles
+
+    async def _startups_affected_by(
+        self,
+        session,
+        investor_ids: Set[str],
+        profiles: List[InvestorProfile]
+    ) -> Set[str]:
+        """Startups whose top-k a set of changed investors can alter"""
+        # Startups currently holding one of them must be recomputed (it may have dropped out)
+        affected = set((await session.execute(
+            select(Match.startup_id).where(Match.investor_id.in_(investor_ids)).distinct()
+        )).scalars().all())
+
+        # Anyone else can only gain one at its stages or a neighbouring one (see InvestorIndex)
+        stages = {int(stage) + offset for profile in profiles for stage in profile.stages for offset in (-1, 0, 1)}
+        if not stages:
+            return affected
+        candidates = _at_stages(stages)
+
+        weakest: Dict[str, Tuple[int, float]] = {
+            startup_id: (count, low)
+            for startup_id, count, low in (await session.execute(
+                select(Match.startup_id, func.count(), func.min(Match.match_score))
+                .join(Company, Company.company_id == Match.startup_id)
+                .where(candidates)
+                .group_by(Match.startup_id)
+            )).all()
+        }
+
+        startups, _ = await self._startups(session, candidates)
+        for doc, overall_score in startups:
+            if doc.id in affected:
+                continue
+            count, low = weakest.get(doc.id, (0, 0.0))
+            try:
+                results = self.index.score(doc, investor_ids, overall_score=overall_score)
+            except Exception as e:
+                print(f"Match feed: skipping startup {doc.id}: {e}")
+                continue
+            if any(count < self.k or result.match_score > low for result in results):
+                affected.add(doc.id)
+
+        return affected
+
+    async def _startups(self, session, condition) -> Tuple[List[Tuple[CompanyDoc, Optional[float]]], Set[str]]:
+        """Companies matching ``condition`` with the overall score of their latest evaluation
+
+        Also returns the ids of rows that don't make a valid CompanyDoc.
+        """
+        newest = (
+            select(Evaluation.company_id, func.max(Evaluation.created_at).label("created_at"))
+            .where(Evaluation.company_id.in_(select(Company.company_id).where(condition)))
+            .group_by(Evaluation.company_id)
+            .subquery()
+        )
+        latest = (
+            select(Evaluation.company_id, Evaluation.overall_score)
+            .join(newest, and_(
+                Evaluation.company_id == newest.c.company_id, Evaluation.created_at == newest.c.created_at
+            ))
+            .subquery()
+        )
+        query = (
+            select(Company, latest.c.overall_score)
+            .outerjoin(latest, latest.c.company_id == Company.company_id)
+            .where(condition)
+        )
+
+        # Keyed by id: evaluations sharing a timestamp would otherwise repeat a company
+        rows = {row.company_id: (row, score) for row, score in (await session.execute(query)).all()}
+        startups, invalid = [], set()
+        for row, score in rows.values():
+            try:
+                startups.append((company_doc_from_row(row), score))
+            except Exception as e:
+                print(f"Match feed: skipping startup {row.company_id}: {e}")
+                invalid.add(row.company_id)
+        return startups, invalid
+
+    async def _rewrite(self, session, startup_ids: Set[str]) -> Tuple[int, Set[str]]:
+        """Replace the stored top-k for each startup; returns rows written and the startups skipped"""
+        if not startup_ids:
+            return 0, set()
+
+        now = datetime.utcnow()
+        ordered = sorted(startup_ids)
+        rows = []
+        failed: Set[str] = set()
+        for start in range(0, len(ordered), self.write_batch_size):
+            chunk = ordered[start:start + self.write_batch_size]
+            startups, invalid = await self._startups(session, Company.company_id.in_(chunk))
+            failed |= invalid
+            for doc, overall_score in startups:
+                try:
+                    results = self.index.match(doc, k=self.k, overall_score=overall_score)
+                except Exception as e:
+                    print(f"Match feed: skipping startup {doc.id}: {e}")
+                    failed.add(doc.id)
+                    continue
+                rows.extend(_match_row(result, now) for result in results)
+
+        # Deleted companies simply lose their matches; skipped ones keep their previous top-k
+        replaced = [startup_id for startup_id in ordered if startup_id not in failed]
+        for start in range(0, len(replaced), self.write_batch_size):
+            await session.execute(
+                delete(Match).where(Match.startup_id.in_(replaced[start:start + self.write_batch_size]))
+            )
+        for start in range(0, len(rows), self.write_batch_size):
+            await session.execute(insert(Match.__table__), rows[start:start + self.write_batch_size])
+
+        return len(rows), failed
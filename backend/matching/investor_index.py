@@ -0,0 +1,369 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..agents.keywords import KeywordMatcher, normalize
+from ..database import Investor
+from ..models import CompanyDoc, EvaluationResult, InvestorProfile, LifecycleStage, MatchResult
+from .thesis_index import ThesisIndex
+
+# Alignment weights; investors without a thesis are scored on the other
+# three, rescaled. The evaluation score shifts every candidate equally.
+ALIGNMENT_WEIGHTS = {"stage": 0.3, "domain": 0.3, "geographic": 0.2, "thesis": 0.2}
+THESIS_REASON_THRESHOLD = 0.2
+EVALUATION_WEIGHT = 0.2
+
+# Investors listing this region invest everywhere
+GLOBAL_REGION = "global"
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+def _as_domains(value) -> List[str]:
+    """Domain list from free-form input: a single string counts as one domain"""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple, set)):
+        return [domain for domain in value if isinstance(domain, str)]
+    return []
+
+def _as_amount(value) -> Optional[float]:
+    """Finite float from free-form input, or None if it isn't one"""
+    if isinstance(value, bool):
+        return None
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        return None
+    return amount if np.isfinite(amount) else None
+
+def profile_from_row(row: Investor) -> InvestorProfile:
+    """InvestorProfile for an `investors` table row"""
+    return InvestorProfile(
+        id=row.investor_id,
+        name=row.name,
+        type=row.type,
+        stages=row.stages or [],
+        domains=row.domains or [],
+        regions=row.regions or [],
+        ticket_size_min=row.ticket_size_min,
+        ticket_size_max=row.ticket_size_max,
+        portfolio_companies=row.portfolio_companies or [],
+        investment_thesis=row.investment_thesis,
+        verified=bool(row.verified)
+    )
+
+class InvestorIndex:
+    """In-memory investor index for startup matching
+
+    Each investor gets an integer slot. Stages, domains and regions are
+    inverted indexes (key -> sorted slot array) and ticket bounds are
+    slot-indexed columns. A query unions the postings for the company's
+    stage and its neighbours, drops candidates whose ticket range misses
+    the raise, then scores domain and region overlap with sorted-array
+    membership tests - work is proportional to the candidate set, never
+    to the whole investor base. Thesis alignment comes from a sparse
+    vector index sharing the same slots.
+    """
+
+    def __init__(self, profiles: Iterable[InvestorProfile] = ()):
+        self._slots: Dict[str, int] = {}
+        self._profiles: List[Optional[InvestorProfile]] = []
+        self._free: List[int] = []
+
+        self._postings: Dict[Tuple[str, object], Set[int]] = {}
+        self._arrays: Dict[Tuple[str, object], np.ndarray] = {}
+
+        self._ticket_min = np.zeros(0, dtype=np.float64)
+        self._ticket_max = np.zeros(0, dtype=np.float64)
+        self._has_thesis = np.zeros(0, dtype=bool)
+        self._domain_matcher: Optional[KeywordMatcher] = None
+        self.thesis = ThesisIndex()
+
+        self.upsert_many(profiles)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, investor_id: str) -> bool:
+        return investor_id in self._slots
+
+    def get(self, investor_id: str) -> Optional[InvestorProfile]:
+        slot = self._slots.get(investor_id)
+        return self._profiles[slot] if slot is not None else None
+
+    def upsert(self, profile: InvestorProfile):
+        """Add an investor, or re-index one whose profile changed"""
+        slot = self._index(profile)
+        self.thesis.set(slot, profile.investment_thesis)
+
+    def upsert_many(self, profiles: Iterable[InvestorProfile]):
+        """Bulk upsert; theses are vectorized and merged in one pass"""
+        theses = {self._index(profile): profile.investment_thesis for profile in profiles}
+        self.thesis.set_many(theses)
+
+    def _index(self, profile: InvestorProfile) -> int:
+        slot = self._slots.get(profile.id)
+        if slot is None:
+            slot = self._allocate()
+            self._slots[profile.id] = slot
+        else:
+            self._unindex(slot)
+
+        self._profiles[slot] = profile
+        self._domain_matcher = None
+        for key in self._keys(profile):
+            self._postings.setdefault(key, set()).add(slot)
+            self._arrays.pop(key, None)
+
+        self._ticket_min[slot] = profile.ticket_size_min if profile.ticket_size_min is not None else 0.0
+        self._ticket_max[slot] = profile.ticket_size_max if profile.ticket_size_max is not None else np.inf
+        self._has_thesis[slot] = bool(profile.investment_thesis)
+        return slot
+
+    def remove(self, investor_id: str) -> bool:
+        """Drop an investor; returns False if it wasn't indexed"""
+        slot = self._slots.pop(investor_id, None)
+        if slot is None:
+            return False
+
+        self._unindex(slot)
+        self._profiles[slot] = None
+        self._has_thesis[slot] = False
+        self.thesis.remove(slot)
+        self._free.append(slot)
+        return True
+
+    def match(
+        self,
+        company_doc: CompanyDoc,
+        evaluation: Optional[EvaluationResult] = None,
+        k: int = 10,
+        domains: Optional[Sequence[str]] = None,
+        region: Optional[str] = None,
+        ticket_size: Optional[float] = None,
+        overall_score: Optional[float] = None
+    ) -> List[MatchResult]:
+        """Top-k investors for a company, best first
+
+        ``domains``, ``region`` and ``ticket_size`` default to the company's
+        financials ("domains", "region", "funding_ask"); domains that are
+        still unknown are inferred from the description against the
+        indexed domain vocabulary. ``overall_score`` stands in for the
+        evaluation when only its score is at hand.
+        """
+        if k <= 0:
+            return []
+
+        domains, region, ticket_size = self._criteria(company_doc, domains, region, ticket_size)
+        candidates = self._candidates(int(company_doc.stage), ticket_size)
+        if evaluation is not None:
+            overall_score = evaluation.overall_score
+
+        return self._score(company_doc, candidates, overall_score, domains, region, ticket_size, k)
+
+    def score(
+        self,
+        company_doc: CompanyDoc,
+        investor_ids: Iterable[str],
+        evaluation: Optional[EvaluationResult] = None,
+        overall_score: Optional[float] = None
+    ) -> List[MatchResult]:
+        """Score specific investors against a company, best first
+
+        Investors that ``match`` would never return (unknown, wrong stage,
+        ticket range missing the raise) are left out.
+        """
+        domains, region, ticket_size = self._criteria(company_doc, None, None, None)
+        wanted = np.array(sorted({self._slots[i] for i in investor_ids if i in self._slots}), dtype=np.int64)
+        candidates = np.intersect1d(self._candidates(int(company_doc.stage), ticket_size), wanted, assume_unique=True)
+        if evaluation is not None:
+            overall_score = evaluation.overall_score
+
+        return self._score(company_doc, candidates, overall_score, domains, region, ticket_size, len(candidates))
+
+    def _criteria(
+        self,
+        company_doc: CompanyDoc,
+        domains: Optional[Sequence[str]],
+        region: Optional[str],
+        ticket_size: Optional[float]
+    ) -> Tuple[Sequence[str], Optional[str], Optional[float]]:
+        # financials is free-form user input: coerce rather than trust its types
+        financials = company_doc.financials or {}
+        if domains is None:
+            domains = _as_domains(financials.get("domains")) or self.infer_domains(company_doc)
+        if region is None:
+            region = financials.get("region")
+        if ticket_size is None:
+            ticket_size = financials.get("funding_ask")
+        return _as_domains(domains), region if isinstance(region, str) else None, _as_amount(ticket_size)
+
+    def _candidates(self, stage: int, ticket_size: Optional[float]) -> np.ndarray:
+        """Slots investing at this stage or a neighbouring one whose ticket range fits"""
+        candidates = np.union1d(
+            self._posting(("stage", stage)),
+            np.union1d(self._posting(("stage", stage - 1)), self._posting(("stage", stage + 1)))
+        )
+
+        if ticket_size is not None and len(candidates):
+            fits = (self._ticket_min[candidates] <= ticket_size) & (self._ticket_max[candidates] >= ticket_size)
+            candidates = candidates[fits]
+        return candidates
+
+    def _score(
+        self,
+        company_doc: CompanyDoc,
+        candidates: np.ndarray,
+        overall_score: Optional[float],
+        domains: Sequence[str],
+        region: Optional[str],
+        ticket_size: Optional[float],
+        k: int
+    ) -> List[MatchResult]:
+        if k <= 0 or not len(candidates):
+            return []
+
+        stage = int(company_doc.stage)
+        stage_alignment = np.where(
+            np.isin(candidates, self._posting(("stage", stage)), assume_unique=True), 1.0, 0.5
+        )
+
+        domain_keys = sorted({normalize(domain) for domain in domains} - {""})
+        domain_hits = np.zeros(len(candidates), dtype=np.int64)
+        for domain in domain_keys:
+            domain_hits += np.isin(candidates, self._posting(("domain", domain)), assume_unique=True)
+        if domain_keys:
+            domain_alignment = domain_hits / len(domain_keys)
+        else:
+            domain_alignment = np.full(len(candidates), 0.5)
+
+        if region:
+            in_region = np.isin(candidates, self._posting(("region", normalize(region))), assume_unique=True)
+            in_region |= np.isin(candidates, self._posting(("region", GLOBAL_REGION)), assume_unique=True)
+            geographic_alignment = in_region.astype(np.float64)
+        else:
+            geographic_alignment = np.full(len(candidates), 0.5)
+
+        # One sparse mat-vec scores the company against the candidates' theses
+        thesis_text = " ".join(filter(None, (company_doc.description, company_doc.business_model)))
+        thesis_alignment = self.thesis.similarities(thesis_text, candidates)
+        has_thesis = self._has_thesis[candidates]
+
+        base = (
+            ALIGNMENT_WEIGHTS["stage"] * stage_alignment
+            + ALIGNMENT_WEIGHTS["domain"] * domain_alignment
+            + ALIGNMENT_WEIGHTS["geographic"] * geographic_alignment
+        )
+        alignment = np.where(
+            has_thesis,
+            base + ALIGNMENT_WEIGHTS["thesis"] * thesis_alignment,
+            base / (1 - ALIGNMENT_WEIGHTS["thesis"])
+        )
+        quality = overall_score if overall_score is not None else 0.5
+        scores = (1 - EVALUATION_WEIGHT) * alignment + EVALUATION_WEIGHT * quality
+
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        results = []
+        for position in top:
+            profile = self._profiles[candidates[position]]
+            thesis = float(thesis_alignment[position]) if has_thesis[position] else None
+            reasons = self._reasons(profile, stage, domain_keys, region, ticket_size)
+            if thesis is not None and thesis >= THESIS_REASON_THRESHOLD:
+                reasons.append("Investment thesis aligns with the company")
+            results.append(MatchResult(
+                startup_id=company_doc.id,
+                investor_id=profile.id,
+                match_score=round(float(min(max(scores[position], 0.0), 1.0)), 4),
+                match_reasons=reasons,
+                stage_alignment=float(stage_alignment[position]),
+                domain_alignment=float(domain_alignment[position]),
+                geographic_alignment=float(geographic_alignment[position]),
+                thesis_alignment=round(thesis, 4) if thesis is not None else None
+            ))
+        return results
+
+    def infer_domains(self, company_doc: CompanyDoc) -> List[str]:
+        """Indexed domains mentioned in the company's description or business model"""
+        if self._domain_matcher is None:
+            self._domain_matcher = KeywordMatcher(
+                domain for kind, domain in self._postings if kind == "domain"
+            )
+        hits = set()
+        for text in (company_doc.description, company_doc.business_model):
+            if text:
+                hits |= self._domain_matcher.find(text)
+        return sorted(hits)
+
+    def _reasons(
+        self,
+        profile: InvestorProfile,
+        stage: int,
+        domain_keys: List[str],
+        region: Optional[str],
+        ticket_size: Optional[float]
+    ) -> List[str]:
+        reasons = []
+        if stage in profile.stages:
+            reasons.append(f"Invests at the {LifecycleStage(stage).name.replace('_', ' ').lower()} stage")
+        else:
+            reasons.append("Invests at an adjacent stage")
+
+        shared = [domain for domain in profile.domains if normalize(domain) in domain_keys]
+        if shared:
+            reasons.append(f"Focus on {', '.join(shared)}")
+
+        if region:
+            regions = {normalize(r) for r in profile.regions}
+            if normalize(region) in regions:
+                reasons.append(f"Active in {region}")
+            elif GLOBAL_REGION in regions:
+                reasons.append("Invests globally")
+
+        if ticket_size is not None and (profile.ticket_size_min is not None or profile.ticket_size_max is not None):
+            reasons.append("Ticket size fits the raise")
+        if profile.verified:
+            reasons.append("Verified investor")
+        return reasons
+
+    def _keys(self, profile: InvestorProfile) -> Set[Tuple[str, object]]:
+        keys: Set[Tuple[str, object]] = {("stage", int(stage)) for stage in profile.stages}
+        keys.update(("domain", normalize(domain)) for domain in profile.domains)
+        keys.update(("region", normalize(region)) for region in profile.regions)
+        return {key for key in keys if key[1] != ""}
+
+    def _unindex(self, slot: int):
+        for key in self._keys(self._profiles[slot]):
+            postings = self._postings.get(key)
+            if postings is not None:
+                postings.discard(slot)
+                if not postings:
+                    del self._postings[key]
+            self._arrays.pop(key, None)
+
+    def _posting(self, key: Tuple[str, object]) -> np.ndarray:
+        """Sorted slot array for a key (compiled lazily after changes)"""
+        array = self._arrays.get(key)
+        if array is None:
+            postings = self._postings.get(key)
+            if not postings:
+                return _EMPTY
+            array = self._arrays[key] = np.fromiter(sorted(postings), dtype=np.int64, count=len(postings))
+        return array
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+
+        slot = len(self._profiles)
+        self._profiles.append(None)
+        if slot >= len(self._ticket_min):
+            capacity = max(1024, 2 * len(self._ticket_min))
+            self._ticket_min = np.resize(self._ticket_min, capacity)
+            self._ticket_max = np.resize(self._ticket_max, capacity)
+            self._has_thesis = np.resize(self._has_thesis, capacity)
+        return slot
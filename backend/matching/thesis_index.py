@@ -0,0 +1,109 @@
+from typing import Dict, Optional
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+class ThesisIndex:
+    """Sparse vector index over investment theses
+
+    Texts are embedded with a stateless hashing vectorizer (unigrams and
+    bigrams, L2-normalized), so a vector never depends on the rest of the
+    corpus and edits stay local. Rows live in one CSR matrix addressed by
+    investor slot; similarity of a company against every thesis is a
+    single sparse matrix-vector product. Edits land in a small pending
+    set that overrides the matrix until ``compact_threshold`` of them have
+    accumulated and are merged in one pass.
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, compact_threshold: int = 1024):
+        self.compact_threshold = compact_threshold
+        self._vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            stop_words="english",
+            alternate_sign=False,
+            norm="l2"
+        )
+        self._matrix = sp.csr_matrix((0, n_features), dtype=np.float64)
+        self._pending: Dict[int, sp.csr_matrix] = {}
+        self._rows = 0
+
+    def vectorize(self, text: str) -> sp.csr_matrix:
+        return self._vectorizer.transform([text])
+
+    def set(self, slot: int, text: Optional[str]):
+        """Index (or re-index) the thesis stored at a slot"""
+        self._rows = max(self._rows, slot + 1)
+        self._pending[slot] = self.vectorize(text or "")
+        if len(self._pending) >= self.compact_threshold:
+            self.compact()
+
+    def set_many(self, texts: Dict[int, Optional[str]]):
+        """Index many slots with one vectorizer pass and one merge"""
+        if not texts:
+            return
+
+        self.compact()
+        slots = np.fromiter(texts, dtype=np.int64, count=len(texts))
+        self._rows = max(self._rows, int(slots.max()) + 1)
+        self._merge(slots, self._vectorizer.transform([text or "" for text in texts.values()]))
+
+    def remove(self, slot: int):
+        if slot < self._rows:
+            self.set(slot, None)
+
+    def similarities(self, text: str, slots: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of text against every slot, or just ``slots`` (0 for empty slots)"""
+        if slots is None:
+            slots_given, scores = False, np.zeros(self._rows, dtype=np.float64)
+        else:
+            slots = np.asarray(slots, dtype=np.int64)
+            slots_given, scores = True, np.zeros(len(slots), dtype=np.float64)
+        if not text or not self._rows:
+            return scores
+
+        # A dense query makes this a plain CSR mat-vec, much cheaper than sparse @ sparse
+        query = self.vectorize(text).toarray().ravel()
+        stored = self._matrix.shape[0]
+
+        if not slots_given:
+            if stored:
+                scores[:stored] = self._matrix @ query
+            for slot, row in self._pending.items():
+                scores[slot] = (row @ query)[0]
+            return scores
+
+        in_matrix = slots < stored
+        if in_matrix.any():
+            scores[in_matrix] = self._matrix[slots[in_matrix]] @ query
+        if self._pending:
+            pending = np.fromiter(self._pending, dtype=np.int64, count=len(self._pending))
+            for position in np.flatnonzero(np.isin(slots, pending)):
+                scores[position] = (self._pending[int(slots[position])] @ query)[0]
+        return scores
+
+    def compact(self):
+        """Merge pending edits into the matrix"""
+        if self._pending:
+            slots = np.fromiter(self._pending, dtype=np.int64, count=len(self._pending))
+            self._merge(slots, sp.vstack(list(self._pending.values()), format="csr"))
+            self._pending.clear()
+
+    def _merge(self, slots: np.ndarray, rows: sp.csr_matrix):
+        """Replace the matrix rows at ``slots`` with ``rows`` in one O(nnz) pass"""
+        n_features = self._matrix.shape[1]
+        matrix = self._matrix
+        if matrix.shape[0] < self._rows:
+            matrix = sp.vstack([matrix, sp.csr_matrix((self._rows - matrix.shape[0], n_features))], format="csr")
+
+        # Blank the edited rows, then add the new ones back at their slots
+        keep = np.ones(self._rows, dtype=np.float64)
+        keep[slots] = 0.0
+        rows = rows.tocoo()
+        matrix = sp.diags(keep, format="csr") @ matrix + sp.csr_matrix(
+            (rows.data, (slots[rows.row], rows.col)), shape=(self._rows, n_features)
+        )
+
+        matrix.eliminate_zeros()
+        self._matrix = matrix.tocsr()
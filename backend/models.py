@@ -41,6 +41,7 @@ class AgentScore(BaseModel):
     reasoning: str
     red_flags: List[str] = Field(default_factory=list)
     recommendations: List[str] = Field(default_factory=list)
+    degraded: bool = False  # True when the agent fell back to a default score
 
 class EvaluationResult(BaseModel):
     """Complete evaluation output"""
@@ -55,6 +56,8 @@ class EvaluationResult(BaseModel):
     stage_weights: Dict[str, float]
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     privacy_mode: bool = True
+    partial: bool = False  # True when any agent timed out, failed or fell back
+    degraded_agents: List[str] = Field(default_factory=list)
 
 class InvestorProfile(BaseModel):
     """Investor matching profile"""
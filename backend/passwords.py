@@ -0,0 +1,52 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+class PasswordService:
+    """bcrypt hashing off the event loop
+
+    Each hash or verify costs ~100-300 ms of CPU, so the async methods
+    run it on a small dedicated thread pool (bcrypt releases the GIL):
+    a login burst queues behind ``max_workers`` threads instead of
+    stalling every other request. Hashes made with a different cost
+    factor than ``rounds`` still verify, and ``verify`` hands back a
+    replacement hash so callers can upgrade them on login.
+    """
+
+    def __init__(self, rounds: int = BCRYPT_ROUNDS, max_workers: int = PASSWORD_HASH_WORKERS):
+        self.rounds = rounds
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+
+    def hash_sync(self, password: str) -> str:
+        return self.context.hash(password)
+
+    def verify_sync(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(matches, new hash if the stored one uses an outdated cost)
+
+        A missing or unrecognisable stored hash never matches.
+        """
+        if not hashed:
+            return False, None
+        try:
+            return self.context.verify_and_update(password, hashed)
+        except ValueError as e:
+            print(f"Unusable password hash: {e}")
+            return False, None
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.hash_sync, password)
+
+    async def verify(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.verify_sync, password, hashed)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+password_service = PasswordService()
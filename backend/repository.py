@@ -0,0 +1,254 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal, Company, Evaluation, UserDashboardStats
+from .models import CompanyDoc, EvaluationResult
+
+# Default listing projection - leaves out the large JSON blobs
+LISTING_COLUMNS = ("evaluation_id", "company_id", "user_id", "verdict", "overall_score", "created_at")
+MAX_PAGE_SIZE = 100
+RECENT_EVALUATIONS = 5
+
+def _upsert_insert(session: AsyncSession):
+    """Dialect insert() supporting ON CONFLICT, or None where there isn't one"""
+    return {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(session.bind.dialect.name)
+
+def encode_cursor(created_at: datetime, evaluation_id: str) -> str:
+    """Opaque cursor pointing just past a listed row"""
+    payload = json.dumps([created_at.isoformat(), evaluation_id])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        created_at, evaluation_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at), evaluation_id
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+class EvaluationRepository:
+    """Evaluation history queries backed by the (owner, created_at, id) indexes
+
+    Listings are newest first and keyset-paginated: each page seeks
+    straight to ``(created_at, evaluation_id) < cursor`` in the index, so
+    page N costs the same as page 1 however long the history grows.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, result: EvaluationResult, user_id: str, company_doc: Optional[CompanyDoc] = None) -> Evaluation:
+        """Persist an EvaluationResult and fold it into the user's dashboard aggregates
+
+        With ``company_doc``, the evaluated company is saved too, so the
+        match feed and analytics can read its stage and profile.
+        """
+        if company_doc is not None:
+            await CompanyRepository(self.session).upsert(company_doc, user_id)
+
+        evaluation = Evaluation(
+            evaluation_id=result.id,
+            company_id=result.company_id,
+            user_id=user_id,
+            verdict=result.verdict.value,
+            overall_score=result.overall_score,
+            agent_scores=result.agent_scores,
+            detailed_scores=[score.model_dump(mode="json") for score in result.detailed_scores],
+            explanation=result.explanation,
+            recommendations=result.recommendations,
+            stage_weights=result.stage_weights,
+            created_at=result.timestamp,
+            privacy_mode=result.privacy_mode
+        )
+        self.session.add(evaluation)
+        await DashboardRepository(self.session).record_evaluation(
+            user_id, result, company_doc.name if company_doc is not None else None
+        )
+        await self.session.flush()
+        return evaluation
+
+    async def list_by_user(
+        self,
+        user_id: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        columns: Sequence[str] = LISTING_COLUMNS
+    ) -> Dict[str, Any]:
+        return await self._list(Evaluation.user_id == user_id, limit, cursor, columns)
+
+    async def list_by_company(
+        self,
+        company_id: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        columns: Sequence[str] = LISTING_COLUMNS,
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """A company's evaluations; pass ``user_id`` to only include that user's"""
+        owner_filter = Evaluation.company_id == company_id
+        if user_id is not None:
+            owner_filter = owner_filter & (Evaluation.user_id == user_id)
+        return await self._list(owner_filter, limit, cursor, columns)
+
+    async def _list(self, owner_filter, limit: int, cursor: Optional[str], columns: Sequence[str]) -> Dict[str, Any]:
+        """One page of rows as dicts, plus the cursor for the next page"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        unknown = set(columns) - set(Evaluation.__table__.columns.keys())
+        if unknown:
+            raise ValueError(f"Unknown evaluation columns: {sorted(unknown)}")
+
+        # Cursor columns are always selected so the next page can be addressed
+        selected = list(dict.fromkeys([*columns, "created_at", "evaluation_id"]))
+        query = (
+            select(*(getattr(Evaluation, column) for column in selected))
+            .where(owner_filter)
+            .order_by(Evaluation.created_at.desc(), Evaluation.evaluation_id.desc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            query = query.where(
+                tuple_(Evaluation.created_at, Evaluation.evaluation_id) < tuple_(*decode_cursor(cursor))
+            )
+
+        rows = (await self.session.execute(query)).mappings().all()
+        page = rows[:limit]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last["created_at"], last["evaluation_id"])
+
+        items: List[Dict[str, Any]] = [{column: row[column] for column in columns} for row in page]
+        return {"items": items, "next_cursor": next_cursor}
+
+class CompanyRepository:
+    """The `companies` rows behind evaluations and investor matching"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def upsert(self, company_doc: CompanyDoc, user_id: str):
+        """Insert or refresh a company; a row submitted by another user is left untouched"""
+        values = {
+            "company_id": company_doc.id,
+            "name": company_doc.name,
+            "stage": int(company_doc.stage),
+            "description": company_doc.description,
+            "market_size": company_doc.market_size,
+            "business_model": company_doc.business_model,
+            "team_info": company_doc.team_info,
+            "financials": company_doc.financials,
+            "submitted_by": user_id,
+            "privacy_mode": company_doc.privacy_mode,
+            "created_at": datetime.utcnow()
+        }
+        updated = {key: value for key, value in values.items() if key not in ("company_id", "created_at")}
+
+        insert = _upsert_insert(self.session)
+        if insert is not None:
+            statement = insert(Company).values(**values)
+            await self.session.execute(statement.on_conflict_do_update(
+                index_elements=["company_id"],
+                set_=updated,
+                where=Company.submitted_by == statement.excluded.submitted_by
+            ))
+            return
+
+        company = await self.session.get(Company, company_doc.id)
+        if company is None:
+            try:
+                async with self.session.begin_nested():
+                    self.session.add(Company(**values))
+            except IntegrityError:
+                pass
+        elif company.submitted_by == user_id:
+            for key, value in updated.items():
+                setattr(company, key, value)
+
+def _month_key(moment: datetime) -> str:
+    return moment.strftime("%Y-%m")
+
+class DashboardRepository:
+    """Per-user dashboard aggregates read with a single primary-key lookup
+
+    Counters are bumped in the same transaction that writes the
+    evaluation, so reads never COUNT the history. ``reports_this_month``
+    is tagged with the month it counts and resets lazily at rollover.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record_evaluation(self, user_id: str, result: EvaluationResult, company_name: Optional[str] = None):
+        """Apply one new evaluation to the user's aggregates"""
+        month = _month_key(datetime.utcnow())
+
+        # FOR UPDATE on a missing row locks nothing, so make sure it exists first;
+        # the row lock then serializes concurrent writers for the same user
+        await self._ensure_row(user_id, month)
+        stats = await self.session.get(UserDashboardStats, user_id, with_for_update=True, populate_existing=True)
+
+        if stats.stats_month != month:
+            stats.stats_month = month
+            stats.reports_this_month = 0
+
+        summary = {
+            "id": result.id,
+            "company_id": result.company_id,
+            "company_name": company_name,
+            "verdict": result.verdict.value,
+            "score": result.overall_score,
+            "timestamp": result.timestamp.isoformat()
+        }
+        stats.evaluations_count += 1
+        stats.reports_this_month += 1
+        stats.recent_evaluations = [summary, *(stats.recent_evaluations or [])][:RECENT_EVALUATIONS]
+        stats.updated_at = datetime.utcnow()
+
+    async def _ensure_row(self, user_id: str, month: str):
+        """Insert a zeroed aggregates row unless one exists, without conflicting with a concurrent insert"""
+        values = dict(
+            user_id=user_id, evaluations_count=0, reports_this_month=0, stats_month=month,
+            recent_evaluations=[], updated_at=datetime.utcnow()
+        )
+        insert = _upsert_insert(self.session)
+        if insert is not None:
+            await self.session.execute(
+                insert(UserDashboardStats).values(**values).on_conflict_do_nothing(index_elements=["user_id"])
+            )
+            return
+
+        if await self.session.get(UserDashboardStats, user_id) is not None:
+            return
+        try:
+            # Savepoint: losing the race must not roll back the caller's evaluation
+            async with self.session.begin_nested():
+                self.session.add(UserDashboardStats(**values))
+        except IntegrityError:
+            pass
+
+    async def get(self, user_id: str) -> Dict[str, Any]:
+        """Dashboard aggregates for a user (zeros if they have none yet)"""
+        stats = await self.session.get(UserDashboardStats, user_id)
+        if stats is None:
+            return {"evaluations_count": 0, "recent_evaluations": [], "reports_this_month": 0}
+
+        current_month = stats.stats_month == _month_key(datetime.utcnow())
+        return {
+            "evaluations_count": stats.evaluations_count,
+            "recent_evaluations": stats.recent_evaluations or [],
+            "reports_this_month": stats.reports_this_month if current_month else 0
+        }
+
+async def save_evaluation(result: EvaluationResult, user_id: str, company_doc: Optional[CompanyDoc] = None):
+    """Persist an evaluation (with its company and aggregates) in its own transaction"""
+    async with AsyncSessionLocal() as session:
+        await EvaluationRepository(session).add(result, user_id, company_doc)
+        await session.commit()
@@ -0,0 +1,133 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+class TokenCache:
+    """Bounded cache of verified JWT claims keyed by token digest
+
+    An entry never outlives its token: it expires at the token's ``exp``
+    (or after ``max_ttl``, whichever is sooner), so a cache hit can skip
+    signature and expiry verification without accepting an expired
+    token. Revocation goes through ``revoke_token`` / ``revoke_user``,
+    which drop cached entries and make ``is_revoked`` reject the token
+    (or every token the user was issued until now) on later decodes.
+    Thread-safe: sync FastAPI dependencies run on the threadpool.
+    """
+
+    def __init__(self, maxsize: int = 10000, max_ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # digest -> (expires_at, user_id, claims)
+        self._by_user: Dict[str, Set[str]] = {}
+        self._revoked: Dict[str, float] = {}  # digest -> token exp
+        self._revoked_before: Dict[str, float] = {}  # user_id -> tokens issued before this are revoked
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Cached claims, or None on a miss or once the token has expired"""
+        digest = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry[0] <= time.time():
+                self._drop(digest)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, token: str, claims: Dict[str, Any], exp: float, issued_at: Optional[float] = None):
+        """Cache verified claims until ``exp`` (a Unix timestamp)
+
+        Skipped if the token was revoked since it was checked (``issued_at``
+        is its ``iat``), so a revocation racing a decode can't be undone.
+        """
+        expires_at = min(exp, time.time() + self.max_ttl)
+        digest = self.digest(token)
+        user_id = claims.get("user_id")
+
+        with self._lock:
+            if self._is_revoked(digest, user_id, issued_at):
+                return
+            self._entries[digest] = (expires_at, user_id, claims)
+            self._entries.move_to_end(digest)
+            if user_id is not None:
+                self._by_user.setdefault(user_id, set()).add(digest)
+
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+    def is_revoked(self, token: str, user_id: Optional[str], issued_at: Optional[float]) -> bool:
+        with self._lock:
+            return self._is_revoked(self.digest(token), user_id, issued_at)
+
+    def revoke_token(self, token: str, exp: Optional[float] = None):
+        """Reject one token from now on (remembered until it would have expired)"""
+        digest = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if exp is None:
+                exp = entry[0] if entry is not None else time.time() + self.max_ttl
+            self._drop(digest)
+            self._revoked[digest] = exp
+            self._prune_revoked()
+
+    def revoke_user(self, user_id: str):
+        """Reject every token issued to a user so far (logout everywhere, password change)"""
+        with self._lock:
+            self._revoked_before[user_id] = time.time()
+            for digest in list(self._by_user.get(user_id, ())):
+                self._drop(digest)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "revoked_tokens": len(self._revoked),
+                "revoked_users": len(self._revoked_before)
+            }
+
+    def _is_revoked(self, digest: str, user_id: Optional[str], issued_at: Optional[float]) -> bool:
+        if digest in self._revoked:
+            return True
+        revoked_before = self._revoked_before.get(user_id)
+        return revoked_before is not None and (issued_at is None or issued_at <= revoked_before)
+
+    def _drop(self, digest: str):
+        entry = self._entries.pop(digest, None)
+        if entry is not None and entry[1] is not None:
+            digests = self._by_user.get(entry[1])
+            if digests is not None:
+                digests.discard(digest)
+                if not digests:
+                    del self._by_user[entry[1]]
+
+    def _prune_revoked(self):
+        now = time.time()
+        for digest in [digest for digest, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[digest]
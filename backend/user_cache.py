@@ -0,0 +1,178 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .agents.cache import TTLCache
+from .database import User
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+USER_CACHE_SHARED_TTL = int(os.getenv("USER_CACHE_SHARED_TTL", "300"))
+USER_CACHE_URL = os.getenv("USER_CACHE_URL")  # redis://... or "local"; unset = in-process only
+
+# Cached stand-in for "no such user", so unknown ids don't hit the database every request
+_MISSING: Dict[str, Any] = {}
+
+class LocalUserStore:
+    """In-memory stand-in for the shared layer (tests, single-process dev)"""
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+class RedisUserStore:
+    """Shared layer in Redis, so every API process reuses one lookup"""
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.25, socket_connect_timeout=0.25)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._client.get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str, ttl: int):
+        self._client.set(key, value, ex=ttl)
+
+    def delete(self, key: str):
+        self._client.delete(key)
+
+def _shared_store(url: Optional[str]):
+    if not url:
+        return None
+    if url == "local":
+        return LocalUserStore()
+    return RedisUserStore(url)
+
+class UserCache:
+    """Read-through user cache: in-process TTL layer over an optional shared layer
+
+    A hit in the local layer costs a dict lookup. Misses fall through to
+    the shared layer and then to the loader (the database), filling both
+    on the way back. ``invalidate`` drops a user from this process and
+    the shared layer; other processes see the change once their short
+    local TTL runs out. Writes to ``users`` invalidate automatically on
+    commit (see ``_invalidate_committed_users``). Shared-layer errors
+    degrade to a database read rather than failing the request.
+
+    Called on an event loop, the shared-layer delete runs in a thread so
+    a slow Redis never blocks the loop; until it lands, lookups for that
+    user skip the shared layer so they can't pick the stale copy back up.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl: float = USER_CACHE_TTL,
+        shared=None,
+        shared_ttl: int = USER_CACHE_SHARED_TTL
+    ):
+        self.local = TTLCache(maxsize, ttl)
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self.loads = 0
+        self._deleting: Set[str] = set()
+
+    @staticmethod
+    def key(user_id: str) -> str:
+        return f"axivai:user:{user_id}"
+
+    async def get(self, user_id: str, loader: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        """Cached user dict, or None if the loader has no such user"""
+        user = self.local.get(user_id)
+        if user is None and self.shared is not None and user_id not in self._deleting:
+            user = await self._shared_get(user_id)
+            if user is not None:
+                self.local.set(user_id, user)
+
+        if user is None:
+            self.loads += 1
+            user = await loader(user_id) or _MISSING
+            self.local.set(user_id, user)
+            if self.shared is not None:
+                await self._shared_set(user_id, user)
+
+        return user or None
+
+    def invalidate(self, user_id: str):
+        """Forget a user after a tier or profile change"""
+        self.local.invalidate(user_id)
+        if self.shared is None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._shared_delete(user_id)
+            return
+
+        self._deleting.add(user_id)
+        deleting = loop.run_in_executor(None, self._shared_delete, user_id)
+        deleting.add_done_callback(lambda _: self._deleting.discard(user_id))
+
+    def clear(self):
+        self.local.clear()
+        self.loads = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.local.stats(), "loads": self.loads, "shared": type(self.shared).__name__ if self.shared else None}
+
+    def _shared_delete(self, user_id: str):
+        try:
+            self.shared.delete(self.key(user_id))
+        except Exception as e:
+            print(f"User cache invalidation failed for {user_id}: {e}")
+
+    async def _shared_get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = await asyncio.to_thread(self.shared.get, self.key(user_id))
+        except Exception as e:
+            print(f"User cache read failed: {e}")
+            return None
+        return json.loads(value) if value is not None else None
+
+    async def _shared_set(self, user_id: str, user: Dict[str, Any]):
+        try:
+            await asyncio.to_thread(self.shared.set, self.key(user_id), json.dumps(user, default=str), self.shared_ttl)
+        except Exception as e:
+            print(f"User cache write failed: {e}")
+
+user_cache = UserCache(shared=_shared_store(USER_CACHE_URL))
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed: Set[str] = session.info.setdefault("changed_users", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User) and obj.user_id:
+            changed.add(obj.user_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    for user_id in session.info.pop("changed_users", ()):
+        user_cache.invalidate(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("changed_users", None)
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from celery import Celery
+from celery.schedules import crontab
+from celery.result import AsyncResult
+
+from .agents import AgentOrchestrator
+from .models import CompanyDoc
+from .repository import save_evaluation
+
+# Celery configuration (defaults to the compose Redis for broker and results).
+# For tests: CELERY_BROKER_URL=memory:// CELERY_RESULT_BACKEND=cache+memory://
+# CELERY_TASK_ALWAYS_EAGER=1 runs tasks inline without a worker.
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# The match feed keeps its investor index in process memory and only the feed
+# updates it, so its task goes to its own queue, served by a single process:
+#   celery -A backend.worker worker -Q matching --concurrency=1
+MATCH_QUEUE = os.getenv("MATCH_QUEUE", "matching")
+
+celery_app = Celery(
+    "axivai",
+    broker=os.getenv("CELERY_BROKER_URL", REDIS_URL),
+    backend=os.getenv("CELERY_RESULT_BACKEND", REDIS_URL)
+)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,  # Evaluations are long; don't hoard them
+    result_expires=int(os.getenv("EVALUATION_RESULT_TTL", str(24 * 3600))),
+    task_always_eager=os.getenv("CELERY_TASK_ALWAYS_EAGER") == "1",
+    task_store_eager_result=True,
+    task_routes={"axivai.process_match_changes": {"queue": MATCH_QUEUE}},
+    # Drain the match change feed every few seconds (needs `celery ... worker --beat` or a beat process)
+    beat_schedule={
+        "process-match-changes": {
+            "task": "axivai.process_match_changes",
+            "schedule": float(os.getenv("MATCH_REFRESH_INTERVAL", "5"))
+        },
+        "export-evaluation-analytics": {
+            "task": "axivai.export_evaluation_analytics",
+            "schedule": float(os.getenv("ANALYTICS_EXPORT_INTERVAL", "300"))
+        },
+        "archive-audit-logs": {
+            "task": "axivai.archive_audit_logs",
+            "schedule": crontab(hour=3, minute=0)
+        }
+    }
+)
+
+# One orchestrator per worker process and one event loop per thread, so the
+# agent caches and the pooled LLM client are reused across tasks
+_orchestrator: Optional[AgentOrchestrator] = None
+_match_processor = None  # MatchFeedProcessor, built on the first feed task
+_thread_state = threading.local()
+
+def _run(coroutine):
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _thread_state.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coroutine)
+
+def get_orchestrator() -> AgentOrchestrator:
+    global _orchestrator
+
+    if _orchestrator is None:
+        _orchestrator = AgentOrchestrator()
+    return _orchestrator
+
+@celery_app.task(name="axivai.evaluate_company")
+def evaluate_company(company_doc: Dict[str, Any], user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Run the full agent pipeline for one company and return the EvaluationResult
+
+    ``user_id`` is the authenticated submitter; only then is the result
+    saved to their history (never the client-supplied ``submitted_by``).
+    """
+    doc = CompanyDoc.model_validate(company_doc)
+    result = _run(get_orchestrator().evaluate(doc))
+
+    if user_id:
+        try:
+            _run(save_evaluation(result, user_id, doc))
+        except Exception as e:
+            # The result is still returned through the job; only history/aggregates miss it
+            print(f"Failed to persist evaluation {result.id}: {e}")
+
+    return result.model_dump(mode="json")
+
+@celery_app.task(name="axivai.process_match_changes")
+def process_match_changes() -> Dict[str, int]:
+    """Drain the match change feed, recomputing only the affected startups' top-k"""
+    global _match_processor
+
+    if _match_processor is None:
+        from .matching import MatchFeedProcessor
+
+        _match_processor = MatchFeedProcessor()
+
+    totals = {"changes": 0, "startups": 0, "matches": 0, "failed": 0}
+    while True:
+        done = _run(_match_processor.process())
+        for key in totals:
+            totals[key] += done[key]
+        if done["changes"] < _match_processor.batch_size:
+            return totals
+
+@celery_app.task(name="axivai.archive_audit_logs")
+def archive_audit_logs() -> List[str]:
+    """Create upcoming audit partitions and move expired months to Parquet"""
+    from .audit_archive import audit_archive
+
+    audit_archive.ensure_partitions()
+    return audit_archive.archive()
+
+@celery_app.task(name="axivai.export_evaluation_analytics")
+def export_evaluation_analytics() -> int:
+    """Append new evaluations to the columnar analytics store"""
+    from .analytics import evaluation_analytics
+
+    return evaluation_analytics.export()
+
+def _owner_key(job_id: str) -> str:
+    return f"axivai-evaluation-owner-{job_id}"
+
+def submit_evaluation(company_doc: CompanyDoc, user_id: str) -> str:
+    """Enqueue an evaluation (saved to ``user_id``'s history) and return its job id
+
+    The submitter is recorded in the result backend (with the results'
+    expiry) before the task is queued, so only they can poll it - even
+    while it is still pending.
+    """
+    job_id = str(uuid.uuid4())
+    celery_app.backend.set(_owner_key(job_id), user_id)
+    evaluate_company.apply_async((company_doc.model_dump(mode="json"), user_id), task_id=job_id)
+    return job_id
+
+def get_evaluation_status(job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """Job state, plus the result or error once finished; None unless ``user_id`` submitted it"""
+    owner = celery_app.backend.get(_owner_key(job_id))
+    if isinstance(owner, bytes):
+        owner = owner.decode("utf-8")
+    if owner is None or owner != user_id:
+        return None
+
+    job = AsyncResult(job_id, app=celery_app)
+    status = {"job_id": job_id, "status": job.state.lower()}
+
+    if job.successful():
+        status["result"] = job.result
+    elif job.failed():
+        # The traceback stays in the worker log; it can name internals
+        print(f"Evaluation {job_id} failed: {job.result!r}")
+        status["error"] = "Evaluation failed"
+
+    return status
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Concurrency benchmark for serve.py
+
+Starts serve.py in each mode and drives it with many concurrent clients
+fetching the frontend assets and /health, optionally while a few slow
+clients hold connections open mid-request. --revalidate makes clients
+behave like a browser on repeat visits (gzip, If-None-Match with the
+ETag they were last sent), so the bytes column shows what a reload costs.
+
+    python scripts/bench_serve.py
+    python scripts/bench_serve.py --clients 300 --requests 20 --slow-clients 2
+    python scripts/bench_serve.py --modes threaded --revalidate
+"""
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = ["/", "/app.js", "/full.html", "/health"]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start(mode: str) -> tuple:
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "serve.py")],
+        env=dict(os.environ, PORT=str(port), SERVE_MODE=mode),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, port
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"serve.py ({mode}) did not start")
+
+def client(port: int, requests: int, timeout: float, revalidate: bool, stats: dict, lock: threading.Lock):
+    connection = None
+    etags = {}
+    received = 0
+    for i in range(requests):
+        path = PATHS[i % len(PATHS)]
+        headers = {}
+        if revalidate:
+            headers["Accept-Encoding"] = "br, gzip"
+            if path in etags:
+                headers["If-None-Match"] = etags[path]
+        began = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            received += len(response.read())
+            if response.getheader("ETag"):
+                etags[path] = response.getheader("ETag")
+            if response.will_close:
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            with lock:
+                stats["errors"] += 1
+            if connection is not None:
+                connection.close()
+            connection = None
+            continue
+        with lock:
+            stats["latencies"].append(time.perf_counter() - began)
+    if connection is not None:
+        connection.close()
+    with lock:
+        stats["bytes"] += received
+
+def run(mode: str, clients: int, requests: int, slow_clients: int, timeout: float, revalidate: bool) -> dict:
+    process, port = start(mode)
+    slow = []
+    try:
+        # A slow client: sends half a request line and then nothing
+        for _ in range(slow_clients):
+            sock = socket.create_connection(("127.0.0.1", port))
+            sock.sendall(b"GET /app.js HT")
+            slow.append(sock)
+
+        stats, lock = {"latencies": [], "errors": 0, "bytes": 0}, threading.Lock()
+        threads = [
+            threading.Thread(target=client, args=(port, requests, timeout, revalidate, stats, lock))
+            for _ in range(clients)
+        ]
+        began = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+    finally:
+        for sock in slow:
+            sock.close()
+        process.kill()
+        process.wait()
+
+    latencies = sorted(stats["latencies"])
+    percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else float("nan")
+    return {
+        "mode": mode,
+        "ok": len(latencies),
+        "errors": stats["errors"],
+        "kb": stats["bytes"] / 1024,
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(0.5),
+        "p99": percentile(0.99),
+        "elapsed": elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=10, help="requests per client")
+    parser.add_argument("--slow-clients", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=5.0, help="per-request client timeout (s)")
+    parser.add_argument("--modes", default="single,threaded")
+    parser.add_argument("--revalidate", action="store_true", help="send Accept-Encoding and If-None-Match like a browser")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients x {args.requests} requests, {args.slow_clients} slow client(s)")
+    print(f"{'mode':10} {'ok':>7} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'wall s':>8} {'KiB':>10}")
+    for mode in args.modes.split(","):
+        result = run(mode, args.clients, args.requests, args.slow_clients, args.timeout, args.revalidate)
+        print(
+            f"{result['mode']:10} {result['ok']:7d} {result['errors']:7d} {result['rps']:9.0f} "
+            f"{result['p50']:9.1f} {result['p99']:9.1f} {result['elapsed']:8.1f} {result['kb']:10.0f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Fail when the evaluation analytics export or summary misbehaves
+
+Builds a throwaway SQLite database and analytics store, exports into it
+and checks the summary the API serves - including evaluations with no
+`companies` row (NULL stage) mixed in with staged ones, and
+evaluations that commit after newer ones were already exported.
+
+    python scripts/check_analytics.py
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+WORKDIR = tempfile.mkdtemp(prefix="axivai-analytics-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(WORKDIR, 'check.db')}")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+
+from backend.analytics import EvaluationAnalytics  # noqa: E402
+from backend.database import Base, Company, Evaluation  # noqa: E402
+
+START = datetime(2026, 1, 1)
+
+def evaluation(i: int, company_id: str, verdict: str = "validate", score: float = 0.5, created_at: datetime = None) -> dict:
+    return {
+        "evaluation_id": f"e{i:04d}",
+        "company_id": company_id,
+        "user_id": "check",
+        "verdict": verdict,
+        "overall_score": score,
+        "agent_scores": {"model_judge": score, "risk_oracle": 1 - score},
+        "created_at": created_at or START + timedelta(minutes=i)
+    }
+
+def store(name: str):
+    engine = create_engine(f"sqlite:///{os.path.join(WORKDIR, name + '.db')}")
+    Base.metadata.create_all(engine, tables=[Company.__table__, Evaluation.__table__])
+    return engine, EvaluationAnalytics(bind=engine, path=os.path.join(WORKDIR, name))
+
+def check(failures: list, label: str, actual, expected):
+    status = "ok" if actual == expected else "FAIL"
+    print(f"{status:4}  {label}")
+    if actual != expected:
+        print(f"      expected {expected!r}\n      got      {actual!r}")
+        failures.append(label)
+
+def check_null_stages(failures: list):
+    engine, analytics = store("stages")
+    with engine.begin() as conn:
+        conn.execute(insert(Company.__table__), [
+            {"company_id": "staged", "name": "Staged", "stage": 3, "submitted_by": "check"}
+        ])
+        conn.execute(insert(Evaluation.__table__), [
+            evaluation(0, "staged", score=0.4),
+            evaluation(1, "staged", score=0.6),
+            evaluation(2, "no-company-row", score=0.2),
+            evaluation(3, "no-company-row", verdict="pivot", score=0.3)
+        ])
+
+    check(failures, "empty store summarises", analytics.summary()["count"], 0)
+    check(failures, "export writes every evaluation", analytics.export(), 4)
+
+    summary = analytics.summary()
+    check(failures, "mixed NULL/staged summary counts all rows", summary["count"], 4)
+    check(failures, "mixed NULL/staged grouping", sorted(
+        (row["stage"] or 0, row["verdict"], row["count"], row["median"]) for row in summary["by_stage_verdict"]
+    ), [(0, "pivot", 1, 0.3), (0, "validate", 1, 0.2), (3, "validate", 2, 0.5)])
+    check(failures, "stage filter skips NULL stages", analytics.summary(stage=3)["count"], 2)
+    check(failures, "only-NULL selection summarises", analytics.summary(verdict="pivot")["by_stage_verdict"], [
+        {"stage": None, "verdict": "pivot", "count": 1, "mean": 0.3, "median": 0.3}
+    ])
+
+def check_late_commits(failures: list):
+    engine, analytics = store("late")
+    analytics.chunk_size = 3  # several pages per export
+    with engine.begin() as conn:
+        conn.execute(insert(Evaluation.__table__), [evaluation(i, "c") for i in range(10, 20)])
+    check(failures, "first export", analytics.export(), 10)
+    check(failures, "nothing new, nothing exported", analytics.export(), 0)
+
+    # Stamped before evaluation e0019 but committed after it was exported
+    with engine.begin() as conn:
+        conn.execute(insert(Evaluation.__table__), [
+            evaluation(30, "c", created_at=START + timedelta(minutes=15, seconds=30)),
+            evaluation(31, "c", created_at=START + timedelta(minutes=40))
+        ])
+    check(failures, "late commit inside the lookback is exported", analytics.export(), 2)
+    check(failures, "and only once", analytics.export(), 0)
+    check(failures, "store holds every evaluation", analytics.summary()["count"], 12)
+
+    analytics.compact()
+    check(failures, "compaction keeps every evaluation", analytics.summary()["count"], 12)
+
+def main() -> int:
+    failures = []
+    check_null_stages(failures)
+    check_late_commits(failures)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
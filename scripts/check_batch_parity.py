@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Fail when an agent's score_batch diverges from its scalar evaluate()
+
+score_batch must be bit-identical to evaluate() - same floats, same
+reasoning, flags and recommendations - and None exactly where evaluate()
+raises. This scores a seeded random corpus both ways and compares the
+full AgentScore dumps. Both paths are timed with a cold keyword cache.
+
+    python scripts/check_batch_parity.py
+    BATCH_PARITY_DOCS=10000 BATCH_PARITY_SEED=7 python scripts/check_batch_parity.py
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.agents import ModelJudgeAgent, RiskOracleAgent, ValuatorXAgent, keywords  # noqa: E402
+from backend.models import CompanyDoc  # noqa: E402
+
+DOCS = int(os.getenv("BATCH_PARITY_DOCS", "3000"))
+SEED = int(os.getenv("BATCH_PARITY_SEED", "1"))
+
+WORDS = (
+    "ai saas marketplace platform crypto healthcare data google single founder no traction burning cash "
+    "high churn subscription monthly fee freemium commission fintech payments medical software connect "
+    "buyers scaling issues team conflicts product-market fit first mover enterprise b2b regulation"
+).split()
+METRICS = ["revenue", "arr", "mrr", "gmv", "users", "customers", "gross_margin", "burn_rate", "runway_months"]
+
+def random_financials(rng: random.Random) -> dict:
+    financials = {}
+    for metric in METRICS:
+        if rng.random() < 0.3:
+            # evaluate() raises on non-numeric metrics; score_batch must return None there.
+            # Huge ints and bools must match the scalar arithmetic exactly.
+            financials[metric] = "n/a" if rng.random() < 0.02 else rng.choice(
+                [0, rng.randint(1, 10 ** 7), rng.random() * 1e6, rng.random(), 10 ** 16 + 1, True]
+            )
+    return financials
+
+def random_docs(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        CompanyDoc(
+            id=str(i),
+            name=f"company-{i}",
+            stage=rng.randint(1, 8),
+            description=" ".join(rng.choices(WORDS, k=rng.randint(3, 40))),
+            business_model=rng.choice([None, "saas", "marketplace", "transaction", "subscription"]),
+            team_info=rng.choice([None, "short", "x" * 120]),
+            financials=random_financials(rng),
+            submitted_by="parity-check"
+        )
+        for i in range(count)
+    ]
+
+async def scalar_scores(agent, docs: list) -> list:
+    scores = []
+    for doc in docs:
+        try:
+            scores.append(await agent.evaluate(doc))
+        except Exception:
+            scores.append(None)
+    return scores
+
+def clear_keyword_caches():
+    keywords._scan.cache_clear()
+    keywords._scan_many.cache_clear()
+
+async def compare(agent, docs: list) -> tuple:
+    clear_keyword_caches()
+    started = time.perf_counter()
+    batch = agent.score_batch(docs)
+    batch_seconds = time.perf_counter() - started
+
+    clear_keyword_caches()
+    started = time.perf_counter()
+    scalar = await scalar_scores(agent, docs)
+    scalar_seconds = time.perf_counter() - started
+
+    mismatches = [
+        doc.id for doc, scalar_score, batch_score in zip(docs, scalar, batch)
+        if (scalar_score is None) != (batch_score is None) or (
+            scalar_score is not None and scalar_score.model_dump() != batch_score.model_dump()
+        )
+    ]
+
+    if len(batch) != len(docs):
+        mismatches.append(f"<{len(batch)} results for {len(docs)} docs>")
+    return mismatches, batch_seconds, scalar_seconds
+
+async def main() -> int:
+    docs = random_docs(DOCS, SEED)
+
+    # One-off costs either path pays once per process, kept out of the timings
+    import numpy  # noqa: F401
+    agents = [ModelJudgeAgent(), RiskOracleAgent(), ValuatorXAgent()]
+    keywords.get_matcher()
+    failed = False
+    for agent in agents:
+        mismatches, batch_seconds, scalar_seconds = await compare(agent, docs)
+        status = "FAIL" if mismatches else "ok"
+        print(
+            f"{status:4}  {type(agent).__name__:16} {len(mismatches):5d} mismatches / {len(docs)} docs  "
+            f"(batch {batch_seconds * 1000:.0f} ms, scalar {scalar_seconds * 1000:.0f} ms, "
+            f"{scalar_seconds / batch_seconds:.1f}x)"
+        )
+        if mismatches:
+            print(f"      first mismatching doc ids: {', '.join(mismatches[:10])}")
+        failed = failed or bool(mismatches)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
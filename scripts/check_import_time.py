@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Fail when importing the backend gets slower than its budget
+
+Each module is imported in a fresh interpreter a few times and the best
+wall time is compared against the budget. Heavy optional dependencies
+must not be imported at all - they belong at their point of use.
+
+    python scripts/check_import_time.py
+    IMPORT_BUDGET_SECONDS=1.0 python scripts/check_import_time.py backend.main backend.worker
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "2.0"))
+RUNS = int(os.getenv("IMPORT_BUDGET_RUNS", "5"))
+DEFAULT_MODULES = ["backend.main", "backend.worker", "backend.agents"]
+FORBIDDEN = ["numpy", "pandas", "pyarrow", "scipy", "sklearn", "openai", "httpx", "requests"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+def measure(module: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="0")
+    env.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    best = None
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, forbidden=FORBIDDEN)],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+def main(modules) -> int:
+    failed = False
+    for module in modules:
+        result = measure(module)
+        over_budget = result["seconds"] > BUDGET_SECONDS
+        status = "FAIL" if over_budget or result["loaded"] else "ok"
+        print(f"{status:4}  {module:24} {result['seconds'] * 1000:8.1f} ms  (budget {BUDGET_SECONDS * 1000:.0f} ms)")
+        if result["loaded"]:
+            print(f"      eagerly imports: {', '.join(result['loaded'])}")
+        failed = failed or status == "FAIL"
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:] or DEFAULT_MODULES))
@@ -36,7 +36,7 @@ done
 
 # Run database migrations
 echo "🗄️  Running database migrations..."
-docker-compose exec backend python database.py
+docker-compose exec backend python -m backend.database
 
 # Start all services
 echo "🌟 Starting all services..."
@@ -2,22 +2,180 @@
 """
 AXIVAI Platform - All-in-One Server
 Serves both frontend and backend in one process
+
+    PORT=3000 python3 serve.py            # one thread per connection, HTTP/1.1 keep-alive
+    SERVE_MODE=single python3 serve.py    # one connection at a time (debugging)
 """
 
+import gzip
+import hashlib
 import http.server
 import socketserver
+import stat
+import threading
 import json
+import re
 import time
 import os
 import urllib.parse
 from pathlib import Path
 
+try:
+    import brotli  # optional: adds br variants of cached assets
+except ImportError:
+    brotli = None
+
+FRONTEND_DIR = Path(__file__).resolve().parent / 'frontend' / 'public'
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.css': 'text/css; charset=utf-8'
+}
+# Idle keep-alive connections are closed after this many seconds
+KEEPALIVE_TIMEOUT = float(os.getenv('SERVE_KEEPALIVE_TIMEOUT', '15'))
+# Files up to this size are held in memory; larger ones are streamed with sendfile
+ASSET_MAX_SIZE = int(os.getenv('SERVE_ASSET_MAX_SIZE', str(1024 * 1024)))
+# How often a cached file's mtime is re-checked, in seconds
+ASSET_CHECK_INTERVAL = float(os.getenv('SERVE_ASSET_CHECK_INTERVAL', '1'))
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+# Build output like app.3f9a1c2e.js never changes under the same name
+FINGERPRINT_RE = re.compile(r'\.[0-9a-f]{8,}\.\w+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Scoring keyword tables, compiled once into a single word-boundary regex
+TECH_KEYWORDS = ['ai', 'ml', 'machine learning', 'artificial intelligence', 'automation', 'saas', 'platform', 'api']
+MARKET_KEYWORDS = ['b2b', 'enterprise', 'customers', 'market', 'revenue', 'growth', 'scaling']
+GOOD_MODELS = ['saas', 'subscription', 'marketplace', 'freemium']
+
+KEYWORD_RE = re.compile(
+    r'\b(?:' + '|'.join(
+        re.escape(keyword) for keyword in sorted(set(TECH_KEYWORDS + MARKET_KEYWORDS + GOOD_MODELS), key=len, reverse=True)
+    ) + r')\b'
+)
+
+def keyword_hits(text):
+    """Set of scoring keywords found in text, in a single pass"""
+    return set(KEYWORD_RE.findall(text.lower()))
+
+class StaticAsset:
+    """A frontend file held in memory with its compressed variants"""
+    __slots__ = ('path', 'mtime_ns', 'size', 'content_type', 'cache_control', 'etag', 'variants', 'checked_at')
+
+    def __init__(self, path, st, checked_at):
+        self.path = path
+        self.mtime_ns = st.st_mtime_ns
+        self.size = st.st_size
+        self.content_type = CONTENT_TYPES.get(path.suffix, 'application/octet-stream')
+        self.cache_control = IMMUTABLE_CACHE_CONTROL if FINGERPRINT_RE.search(path.name) else 'no-cache'
+        self.checked_at = checked_at
+        self.variants = None  # encoding -> bytes; None when the file is streamed from disk
+        self.etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+        if st.st_size > ASSET_MAX_SIZE:
+            return
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.size = len(data)
+        self.etag = '"%s"' % hashlib.blake2b(data, digest_size=12).hexdigest()
+        self.variants = {'identity': data}
+
+        if self.content_type.startswith(COMPRESSIBLE_TYPES) and len(data) >= 256:
+            compressed = {'gzip': gzip.compress(data, 9, mtime=0)}
+            if brotli is not None:
+                compressed['br'] = brotli.compress(data, quality=11)
+            for encoding, body in compressed.items():
+                if len(body) < len(data):
+                    self.variants[encoding] = body
+
+    def negotiate(self, accept_encoding):
+        """Best stored encoding the client accepts"""
+        accepted = {}
+        for item in accept_encoding.split(','):
+            coding, _, params = item.partition(';')
+            q = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    q = float(params[2:])
+                except ValueError:
+                    q = 0.0
+            accepted[coding.strip().lower()] = q
+        for encoding in ('br', 'gzip'):
+            if encoding in (self.variants or ()) and accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+                return encoding
+        return 'identity'
+
+    def variant_etag(self, encoding):
+        return self.etag if encoding == 'identity' else f'{self.etag[:-1]}-{encoding}"'
+
+    def matches(self, if_none_match):
+        """If-None-Match check (weak comparison, any encoding of the same content)"""
+        for tag in if_none_match.split(','):
+            tag = tag.strip()
+            if tag == '*':
+                return True
+            tag = tag[2:] if tag.startswith('W/') else tag
+            if tag == self.etag or (tag.startswith(self.etag[:-1] + '-') and tag.endswith('"')):
+                return True
+        return False
+
+class AssetCache:
+    """Frontend files by path, re-read only when their mtime or size changes
+
+    A hit costs at most one stat() per ASSET_CHECK_INTERVAL and no reads;
+    bytes and gzip/brotli variants are computed once per file version.
+    """
+
+    def __init__(self, check_interval=ASSET_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """Current asset for path, or None if it isn't a regular file"""
+        now = time.monotonic()
+        asset = self._assets.get(path)
+        if asset is not None and now - asset.checked_at < self.check_interval:
+            return asset
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
+            with self._lock:
+                self._assets.pop(path, None)
+            return None
+
+        if asset is not None and asset.mtime_ns == st.st_mtime_ns and asset.size == st.st_size:
+            asset.checked_at = now
+            return asset
+
+        try:
+            asset = StaticAsset(path, st, now)
+        except OSError:
+            return None
+        with self._lock:
+            self._assets[path] = asset
+        return asset
+
+    def clear(self):
+        with self._lock:
+            self._assets.clear()
+
+asset_cache = AssetCache()
+
 class AxivaiServer(http.server.SimpleHTTPRequestHandler):
+    # Keep-alive: every response below sets Content-Length
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+
     def do_OPTIONS(self):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
     def do_GET(self):
@@ -28,12 +186,18 @@ class AxivaiServer(http.server.SimpleHTTPRequestHandler):
             # Frontend files
             self.serve_frontend()
 
+    def do_HEAD(self):
+        # Frontend files only; SimpleHTTPRequestHandler's default would list the working directory
+        if self.path.startswith('/api/') or self.path == '/health':
+            self.send_empty(405)
+        else:
+            self.serve_frontend()
+
     def do_POST(self):
         if self.path.startswith('/api/'):
             self.handle_api_post()
         else:
-            self.send_response(404)
-            self.end_headers()
+            self.send_empty(404)
 
     def handle_api_get(self):
         if self.path == '/health':
@@ -53,8 +217,7 @@ class AxivaiServer(http.server.SimpleHTTPRequestHandler):
                 'usage_stats': {'reports_this_month': 1, 'tier': 'free'}
             })
         else:
-            self.send_response(404)
-            self.end_headers()
+            self.send_empty(404)
 
     def handle_api_post(self):
         content_length = int(self.headers.get('Content-Length', 0))
@@ -63,8 +226,7 @@ class AxivaiServer(http.server.SimpleHTTPRequestHandler):
         try:
             data = json.loads(post_data.decode('utf-8'))
         except:
-            self.send_response(400)
-            self.end_headers()
+            self.send_empty(400)
             return
 
         if self.path == '/api/auth/login':
@@ -94,15 +256,13 @@ class AxivaiServer(http.server.SimpleHTTPRequestHandler):
                 base_score += 0.1
             
             # Keyword analysis
-            tech_keywords = ['ai', 'ml', 'machine learning', 'artificial intelligence', 'automation', 'saas', 'platform', 'api']
-            market_keywords = ['b2b', 'enterprise', 'customers', 'market', 'revenue', 'growth', 'scaling']
+            description_hits = keyword_hits(description)
             
-            tech_score = sum(0.05 for word in tech_keywords if word in description.lower())
-            market_score = sum(0.04 for word in market_keywords if word in description.lower())
+            tech_score = sum(0.05 for word in TECH_KEYWORDS if word in description_hits)
+            market_score = sum(0.04 for word in MARKET_KEYWORDS if word in description_hits)
             
             # Business model bonus
-            good_models = ['saas', 'subscription', 'marketplace', 'freemium']
-            model_score = 0.1 if any(model in business_model.lower() for model in good_models) else 0
+            model_score = 0.1 if any(model in keyword_hits(business_model) for model in GOOD_MODELS) else 0
             
             # Stage adjustment
             stage_multiplier = {1: 0.8, 2: 0.9, 3: 1.0, 4: 1.1, 5: 1.0, 6: 0.9, 7: 0.7, 8: 1.2}.get(stage, 1.0)
@@ -165,63 +325,108 @@ class AxivaiServer(http.server.SimpleHTTPRequestHandler):
                 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
             })
         else:
-            self.send_response(404)
-            self.end_headers()
+            self.send_empty(404)
 
     def serve_frontend(self):
         # Serve frontend files
-        if self.path == '/' or self.path == '/dashboard' or self.path == '/evaluate':
-            self.path = '/simple.html'  # Default to simple.html for compatibility
+        path = urllib.parse.urlsplit(self.path).path
+        if path == '/' or path == '/dashboard' or path == '/evaluate':
+            path = '/simple.html'  # Default to simple.html for compatibility
         
-        # Remove leading slash and construct file path
-        file_path = Path('frontend/public') / self.path.lstrip('/')
+        # Remove leading slash and construct file path, refusing anything outside FRONTEND_DIR
+        file_path = (FRONTEND_DIR / path.lstrip('/')).resolve()
+        asset = asset_cache.get(file_path) if FRONTEND_DIR in file_path.parents else None
+        if asset is None:
+            # Fallback to simple.html
+            asset = asset_cache.get(FRONTEND_DIR / 'simple.html')
+        
+        if asset is None:
+            body = b'<h1>404 - File not found</h1>'
+            self.send_response(404)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
         
-        if file_path.exists() and file_path.is_file():
+        encoding = asset.negotiate(self.headers.get('Accept-Encoding', ''))
+        if asset.matches(self.headers.get('If-None-Match', '')):
+            self.send_response(304)
+            self.send_asset_headers(asset, encoding)
+            self.end_headers()
+            return
+        
+        if asset.variants is not None:
+            body = asset.variants[encoding]
             self.send_response(200)
-            
-            # Set content type
-            if file_path.suffix == '.html':
-                self.send_header('Content-Type', 'text/html; charset=utf-8')
-            elif file_path.suffix == '.js':
-                self.send_header('Content-Type', 'application/javascript; charset=utf-8')
-            elif file_path.suffix == '.css':
-                self.send_header('Content-Type', 'text/css; charset=utf-8')
-            else:
-                self.send_header('Content-Type', 'application/octet-stream')
-            
-            # Add CORS headers
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Content-Type', asset.content_type)
+            self.send_header('Content-Length', str(len(body)))
+            if encoding != 'identity':
+                self.send_header('Content-Encoding', encoding)
+            self.send_asset_headers(asset, encoding)
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+            return
+        
+        # Too large to cache: stream it
+        try:
+            f = open(asset.path, 'rb')
+        except OSError:
+            self.send_empty(404)
+            return
+        with f:
+            self.send_response(200)
+            self.send_header('Content-Type', asset.content_type)
+            self.send_header('Content-Length', str(os.fstat(f.fileno()).st_size))
+            self.send_asset_headers(asset, encoding)
             self.end_headers()
             
-            with open(file_path, 'rb') as f:
-                self.wfile.write(f.read())
-        else:
-            # Fallback to simple.html
-            simple_path = Path('frontend/public/simple.html')
-            if simple_path.exists():
-                self.send_response(200)
-                self.send_header('Content-Type', 'text/html; charset=utf-8')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                with open(simple_path, 'rb') as f:
-                    self.wfile.write(f.read())
-            else:
-                self.send_response(404)
-                self.send_header('Content-Type', 'text/html')
-                self.end_headers()
-                self.wfile.write(b'<h1>404 - File not found</h1>')
+            # socket.sendfile uses os.sendfile: the kernel copies page cache -> socket
+            # without reading the file into Python (falls back to send() where unsupported)
+            if self.command != 'HEAD':
+                self.connection.sendfile(f)
+
+    def send_asset_headers(self, asset, encoding):
+        self.send_header('ETag', asset.variant_etag(encoding))
+        self.send_header('Cache-Control', asset.cache_control)
+        self.send_header('Vary', 'Accept-Encoding')
+        
+        # Add CORS headers
+        self.send_header('Access-Control-Allow-Origin', '*')
+
+    def send_empty(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
 
     def send_json(self, data, status=200):
+        body = json.dumps(data).encode()
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
         self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(body)
+
+class ThreadingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """One thread per connection, so a slow or idle keep-alive client doesn't block the rest"""
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 512
+
+class SingleConnectionHandler(AxivaiServer):
+    # Serving one connection at a time, it must not stay open between requests
+    protocol_version = 'HTTP/1.0'
+
+def make_server(port, threaded=True):
+    if threaded:
+        return ThreadingServer(("", port), AxivaiServer)
+    return socketserver.TCPServer(("", port), SingleConnectionHandler)
 
-def start_server(port=3000):
+def start_server(port=3000, threaded=True):
     try:
-        with socketserver.TCPServer(("", port), AxivaiServer) as httpd:
+        with make_server(port, threaded) as httpd:
             print("🚀 AXIVAI Platform Started Successfully!")
             print("=" * 50)
             print(f"🌐 Frontend: http://localhost:{port}")
@@ -244,11 +449,11 @@ def start_server(port=3000):
         if "Address already in use" in str(e):
             print(f"❌ Port {port} is already in use")
             print(f"🔄 Trying port {port + 1}...")
-            start_server(port + 1)
+            start_server(port + 1, threaded)
         else:
             print(f"❌ Error starting server: {e}")
 
 if __name__ == "__main__":
     # Change to script directory
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    start_server()
\ No newline at end of file
+    start_server(int(os.getenv('PORT', '3000')), threaded=os.getenv('SERVE_MODE', 'threaded') != 'single')
\ No newline at end of file